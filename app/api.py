@@ -2,14 +2,22 @@
 API module for interacting with the CoinGecko API directly using requests.
 """
 import requests
+import hashlib
+import threading
 import time
 import os
 import json
 from datetime import datetime
-from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional
 
-load_dotenv()
+from .utils.cache import write_json_cache
+
+# Only parse .env when the environment doesn't already provide the API settings;
+# CRYPTOCLI_SKIP_DOTENV=1 skips it entirely
+if os.getenv("CRYPTOCLI_SKIP_DOTENV") != "1" and not (
+        os.getenv("COINGECKO_BASE_URL") and os.getenv("COINGECKO_API_KEY")):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 
 class CoinGeckoAPI:
@@ -23,7 +31,19 @@ class CoinGeckoAPI:
     if COINGECKO_API_KEY is None:
         raise ValueError("COINGECKO_API_KEY not set in environment variables.")
 
+    # Seconds to reuse OHLC/market chart responses for 1-day and longer ranges
+    INTRADAY_CACHE_TTL = 60
+    CHART_CACHE_TTL = 60 * 60
+
+    # On-disk price cache: fresh for PRICE_CACHE_TTL seconds, then served stale
+    # for up to PRICE_CACHE_SWR more seconds while a refresh runs in the background
+    PRICE_CACHE_DIR = os.path.expanduser("~/.cache/cryptocli/prices")
+    PRICE_CACHE_TTL = float(os.getenv("CRYPTOCLI_PRICE_CACHE_TTL", "10"))
+    PRICE_CACHE_SWR = float(os.getenv("CRYPTOCLI_PRICE_CACHE_SWR", "30"))
+
     def __init__(self):
+        # Every command goes through the module-level api instance, so this one
+        # keep-alive session pools connections and TLS setup for the whole process
         self.session = requests.Session()
         self.session.headers.update({
             "Accept": "application/json",
@@ -33,6 +53,11 @@ class CoinGeckoAPI:
         self.last_request_time = 0
         # Wait at least 1.5s between requests to respect rate limits
         self.rate_limit_wait = 1.5
+        # Guard shared state when requests are issued from several threads
+        self._rate_limit_lock = threading.Lock()
+        self._usage_lock = threading.Lock()
+        # Recent chart responses keyed by (endpoint, params) -> (fetched_at, data)
+        self._response_cache = {}
 
         # Usage tracking properties
         self.usage_data = {
@@ -48,13 +73,14 @@ class CoinGeckoAPI:
 
     def _respect_rate_limit(self):
         """Ensures we don't exceed rate limits by enforcing delays between requests."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-
-        if elapsed < self.rate_limit_wait:
-            time.sleep(self.rate_limit_wait - elapsed)
+        # Reserve the next request slot under the lock so concurrent callers stay spaced out
+        with self._rate_limit_lock:
+            current_time = time.time()
+            request_time = max(current_time, self.last_request_time + self.rate_limit_wait)
+            self.last_request_time = request_time
 
-        self.last_request_time = time.time()
+        if request_time > current_time:
+            time.sleep(request_time - current_time)
 
     def _extract_rate_limit_headers(self, headers: Dict[str, str]) -> Dict[str, Any]:
         """Extract rate limit information from response headers."""
@@ -182,7 +208,8 @@ class CoinGeckoAPI:
             # Extract and store rate limit information
             rate_limit_info = self._extract_rate_limit_headers(
                 response.headers)
-            self._update_usage_stats(endpoint, rate_limit_info)
+            with self._usage_lock:
+                self._update_usage_stats(endpoint, rate_limit_info)
 
             response.raise_for_status()  # Raise exception for 4XX/5XX responses
             return response.json()
@@ -191,6 +218,86 @@ class CoinGeckoAPI:
             # You might want to log this error in a production environment
             raise Exception(error_msg)
 
+    def _cached_request(self, endpoint: str, params: Dict, ttl: float) -> Any:
+        """
+        Make a request, reusing a response fetched within the last ttl seconds.
+
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters for the request
+            ttl: How long a cached response stays valid, in seconds
+
+        Returns:
+            JSON response, possibly served from the in-process cache
+        """
+        key = (endpoint, tuple(sorted(params.items())))
+        now = time.time()
+        cached = self._response_cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            return cached[1]
+
+        data = self._make_request(endpoint, params)
+        self._response_cache[key] = (now, data)
+        return data
+
+    def _price_cache_path(self, endpoint: str, params: Dict) -> str:
+        """Return the on-disk cache file for a price request."""
+        key = json.dumps([endpoint, sorted(params.items())])
+        return os.path.join(self.PRICE_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _store_price_cache(self, path: str, data: Any):
+        """Write a price response to the on-disk cache atomically."""
+        write_json_cache(path, {"fetched_at": time.time(), "data": data})
+
+    def _refresh_price_cache(self, endpoint: str, params: Dict, path: str):
+        """Fetch a price response and store it, ignoring failures."""
+        try:
+            self._store_price_cache(path, self._make_request(endpoint, params))
+        except Exception:
+            # The stale copy was already served; the next call will retry
+            pass
+
+    def _swr_request(self, endpoint: str, params: Dict) -> Any:
+        """
+        Make a request through the on-disk stale-while-revalidate price cache.
+
+        Args:
+            endpoint: API endpoint to call
+            params: Query parameters for the request
+
+        Returns:
+            JSON response, fresh or served from the cache
+        """
+        if self.PRICE_CACHE_TTL <= 0:
+            return self._make_request(endpoint, params)
+
+        path = self._price_cache_path(endpoint, params)
+        try:
+            with open(path, 'r') as f:
+                cached = json.load(f)
+            age = time.time() - cached["fetched_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            cached, age = None, None
+
+        if cached is not None and age < self.PRICE_CACHE_TTL:
+            return cached["data"]
+        if cached is not None and age < self.PRICE_CACHE_TTL + self.PRICE_CACHE_SWR:
+            # Serve the stale copy now. The refresh thread is a daemon so a
+            # one-shot command exits without waiting on the network; a refresh
+            # cut short just leaves the stale entry for the next call
+            threading.Thread(target=self._refresh_price_cache,
+                             args=(endpoint, params, path), daemon=True).start()
+            return cached["data"]
+
+        data = self._make_request(endpoint, params)
+        self._store_price_cache(path, data)
+        return data
+
+    @classmethod
+    def _chart_cache_ttl(cls, days: int) -> float:
+        """Intraday charts change quickly; longer ranges only gain a point per hour or day."""
+        return cls.INTRADAY_CACHE_TTL if days == 1 else cls.CHART_CACHE_TTL
+
     def get_price(self, coin_ids: List[str], vs_currencies: List[str]) -> Dict[str, Dict[str, float]]:
         """
         Get current prices for a list of coins in specific currencies.
@@ -206,7 +313,7 @@ class CoinGeckoAPI:
             "ids": ",".join(coin_ids),
             "vs_currencies": ",".join(vs_currencies)
         }
-        return self._make_request("simple/price", params)
+        return self._swr_request("simple/price", params)
 
     def get_coin_markets(self, vs_currency: str = 'usd', count: int = 10,
                          page: int = 1, order: str = 'market_cap_desc') -> List[Dict[str, Any]]:
@@ -229,7 +336,7 @@ class CoinGeckoAPI:
             "order": order,
             "sparkline": False
         }
-        return self._make_request("coins/markets", params)
+        return self._swr_request("coins/markets", params)
 
     def get_coin_data(self, coin_id: str) -> Dict[str, Any]:
         """
@@ -269,7 +376,8 @@ class CoinGeckoAPI:
             "days": days,
             "interval": interval
         }
-        return self._make_request(f"coins/{coin_id}/market_chart", params)
+        return self._cached_request(f"coins/{coin_id}/market_chart", params,
+                                    self._chart_cache_ttl(days))
 
     def get_coin_market_chart_range(self, coin_id: str, vs_currency: str,
                                     from_timestamp: int, to_timestamp: int) -> Dict[str, List]:
@@ -354,7 +462,8 @@ class CoinGeckoAPI:
             "vs_currency": vs_currency,
             "days": days
         }
-        return self._make_request(f"coins/{coin_id}/ohlc", params)
+        return self._cached_request(f"coins/{coin_id}/ohlc", params,
+                                    self._chart_cache_ttl(days))
 
     def get_token_by_contract(
         self,
@@ -8,8 +8,6 @@ from datetime import datetime
 from rich.table import Table
 from rich.panel import Panel
 from rich.console import Console
-from rich.layout import Layout
-from rich.progress import Progress, BarColumn, TextColumn
 from rich.text import Text
 
 from app.api import api
@@ -69,9 +67,9 @@ def display_usage_stats(usage_data: Dict[str, Any]):
     basic_usage_text = Text()
     basic_usage_text.append("API Key: ")
     if rate_limit_info.get("api_key"):
-        basic_usage_text.append(f"[green]{rate_limit_info.get('api_key', 'Unknown')}[/green]\n")
+        basic_usage_text.append(f"{rate_limit_info.get('api_key', 'Unknown')}\n", style="green")
     else:
-        basic_usage_text.append("[yellow]Unknown[/yellow]\n")
+        basic_usage_text.append("Unknown\n", style="yellow")
     
     basic_usage_text.append(f"Total calls: {format_large_number(usage_data.get('total_calls', 0))}\n")
     basic_usage_text.append(f"Calls today: {format_large_number(usage_data.get('calls_today', 0))}\n")
@@ -104,13 +102,15 @@ def display_usage_stats(usage_data: Dict[str, Any]):
             
             rate_limit_text.append("Credits remaining this month: ")
             if remaining > 0.2 * monthly_limit:
-                rate_limit_text.append(f"[green]{format_large_number(remaining)}[/green]\n")
+                rate_limit_text.append(f"{format_large_number(remaining)}\n", style="green")
             elif remaining > 0.05 * monthly_limit:
-                rate_limit_text.append(f"[yellow]{format_large_number(remaining)}[/yellow]\n")
+                rate_limit_text.append(f"{format_large_number(remaining)}\n", style="yellow")
             else:
-                rate_limit_text.append(f"[red]{format_large_number(remaining)}[/red]\n")
+                rate_limit_text.append(f"{format_large_number(remaining)}\n", style="red")
                 
             # Add monthly usage progress bar
+            from rich.progress import Progress, BarColumn, TextColumn
+            
             with Progress(
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
@@ -138,11 +138,11 @@ def display_usage_stats(usage_data: Dict[str, Any]):
             rate_limit_text.append("Remaining requests: ")
             remaining_requests = rate_limit_info['remaining']
             if remaining_requests > 0.5 * rate_limit_info['limit']:
-                rate_limit_text.append(f"[green]{remaining_requests}[/green]\n")
+                rate_limit_text.append(f"{remaining_requests}\n", style="green")
             elif remaining_requests > 0.2 * rate_limit_info['limit']:
-                rate_limit_text.append(f"[yellow]{remaining_requests}[/yellow]\n")
+                rate_limit_text.append(f"{remaining_requests}\n", style="yellow")
             else:
-                rate_limit_text.append(f"[red]{remaining_requests}[/red]\n")
+                rate_limit_text.append(f"{remaining_requests}\n", style="red")
             
             # Add when the rate limit will reset
             if "reset" in rate_limit_info:
@@ -3,12 +3,34 @@ Functionality for retrieving and displaying supported fiat currencies.
 """
 from .api import api
 from .utils.formatting import console, print_error
+from .utils.serialization import dumps_json
+from .utils.cache import write_json_cache
 from rich.table import Table
 from rich.text import Text
+from rich.style import Style
 import json
 import os
+import time
 
-def get_supported_currencies(display=True, save=False, output=None):
+# On-disk cache for the supported currency list, which changes rarely
+CACHE_PATH = os.path.expanduser("~/.cache/cryptocli/vs_currencies.json")
+CACHE_TTL = 24 * 60 * 60
+
+# Known currency codes grouped by category
+CURRENCY_CATEGORIES = {
+    "fiat": frozenset(["usd", "eur", "jpy", "gbp", "aud", "cad", "chf", "cny", "hkd", "nzd", "sek", "krw", "sgd", "nok", "mxn", "inr", "rub", "zar", "try", "brl", "twd", "dkk", "pln", "thb", "idr", "huf", "czk", "ils", "clp", "php", "myr", "bgn", "ngn", "hrk", "rsd", "mad", "ars", "pkr", "sar", "aed", "bob", "cop", "pen", "uah", "vnd"]),
+    "commodity": frozenset(["xag", "xau"]),
+    "crypto": frozenset(["btc", "eth", "ltc", "bch", "bnb", "eos", "xrp", "xlm", "dot", "yfi", "aave", "link", "sats"])
+}
+
+# Flat currency code -> display category lookup
+CATEGORY_OF = {code: cat.capitalize() for cat, codes in CURRENCY_CATEGORIES.items() for code in codes}
+
+# Column styles parsed once rather than on every table build
+_CODE_STYLE = Style(color="cyan", bold=True)
+_CATEGORY_STYLE = Style(color="green")
+
+def get_supported_currencies(display=True, save=False, output=None, refresh=False):
     """
     Get and optionally display a list of supported vs currencies.
     
@@ -16,13 +38,18 @@ def get_supported_currencies(display=True, save=False, output=None):
         display (bool): Whether to display the currencies in the console
         save (bool): Whether to save the currencies to a file
         output (str, optional): Filename to save data to (if save is True)
+        refresh (bool): Whether to bypass the local cache and query the API
         
     Returns:
         list: List of supported currency codes
     """
     try:
-        # Get supported currencies from API
-        currencies = api.get_supported_vs_currencies()
+        # Use the cached list if it is still fresh, otherwise query the API
+        currencies = None if refresh else load_cached_currencies()
+        if currencies is None:
+            currencies = api.get_supported_vs_currencies()
+            if currencies:
+                store_cached_currencies(currencies)
         
         if not currencies:
             print_error("No supported currencies found.")
@@ -42,6 +69,30 @@ def get_supported_currencies(display=True, save=False, output=None):
         print_error(f"Failed to retrieve supported currencies: {str(e)}")
         return None
 
+def load_cached_currencies():
+    """
+    Load the supported currencies from the local cache if it is within the TTL.
+    
+    Returns:
+        list: Cached currency codes, or None if the cache is missing or stale
+    """
+    try:
+        if os.path.getmtime(CACHE_PATH) <= time.time() - CACHE_TTL:
+            return None
+        with open(CACHE_PATH, 'r') as f:
+            return json.load(f)["currencies"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def store_cached_currencies(currencies):
+    """
+    Write the supported currencies to the local cache atomically.
+    
+    Args:
+        currencies (list): List of supported currency codes
+    """
+    write_json_cache(CACHE_PATH, {"fetched_at": time.time(), "currencies": currencies})
+
 def display_supported_currencies(currencies):
     """
     Display supported currencies in an organized table.
@@ -53,30 +104,13 @@ def display_supported_currencies(currencies):
     table = Table(title="Supported Fiat Currencies for Price Conversion")
     
     # Define columns
-    table.add_column("Code", style="cyan bold")
-    table.add_column("Category", style="green")
+    table.add_column("Code", style=_CODE_STYLE)
+    table.add_column("Category", style=_CATEGORY_STYLE)
     
-    # Dictionary for categorizing currencies
-    categories = {
-        "fiat": ["usd", "eur", "jpy", "gbp", "aud", "cad", "chf", "cny", "hkd", "nzd", "sek", "krw", "sgd", "nok", "mxn", "inr", "rub", "zar", "try", "brl", "twd", "dkk", "pln", "thb", "idr", "huf", "czk", "ils", "clp", "php", "myr", "bgn", "ngn", "hrk", "rsd", "mad", "ars", "pkr", "sar", "aed", "bob", "cop", "pen", "uah", "vnd"],
-        "commodity": ["xag", "xau"],
-        "crypto": ["btc", "eth", "ltc", "bch", "bnb", "eos", "xrp", "xlm", "dot", "yfi", "aave", "link", "sats"]
-    }
-    
-    # Group currencies by category
-    sorted_currencies = sorted(currencies)
-    for currency in sorted_currencies:
-        currency_code = currency.lower()
-        category = "Other"
-        
-        # Find category
-        for cat, codes in categories.items():
-            if currency_code in codes:
-                category = cat.capitalize()
-                break
-                
-        # Add row to table
-        table.add_row(currency.upper(), category)
+    # Group currencies by category; the API returns lowercase codes already
+    rows = [(code.upper(), CATEGORY_OF.get(code, "Other")) for code in sorted(currencies)]
+    for row in rows:
+        table.add_row(*row)
     
     # Display the table
     console.print(table)
@@ -101,8 +135,8 @@ def save_currencies_data(currencies, filename=None):
         }
         
         # Write to file
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(filename, 'wb') as f:
+            f.write(dumps_json(data, pretty=True))
             
         console.print(f"[green]Currency data saved to[/green] {filename}")
         
@@ -1,6 +1,8 @@
 """
 Main CLI entry point for the crypto-stats application.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 from app.companies import get_companies_treasury
 from app.currencies import get_supported_currencies
 from app.defi_data import get_defi_data
@@ -16,25 +18,28 @@ from app.utils.formatting import (
 )
 from app.search import search_cryptocurrencies
 from app.history import get_historical_prices, DAY, WEEK, MONTH, YEAR, save_historical_data
-from app.price import get_current_prices, get_prices_with_change
+from app.price import get_current_prices, get_prices_with_change, format_detailed_price_table
 from app.api import api
 from app.api_usage import get_api_usage, display_usage_stats, save_api_usage_export
 from app.gainers_losers import get_gainers_losers, TimePeriod
 from app.newly_listed import get_newly_listed_coins, display_new_coin_details, get_detailed_analysis
 import click
-from rich.console import Console
 from rich.table import Table
 import sys
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 
 DEFAULT_CURRENCY = "usd"
 DEFAULT_LIMIT = 10
 
+# Options shared verbatim by several commands
+OUTPUT_OPTION = click.option('--output', '-o', type=str, default=None,
+                             help='Filename to save data to (requires --save)')
+PRETTY_OPTION = click.option('--pretty', is_flag=True,
+                             help='Indent the saved JSON file for reading (requires --save)')
+NFT_CURRENCY_OPTION = click.option('--currency', '-c', default='usd',
+                                   help='Currency to display prices in (e.g., usd, eth)')
+
 
 @click.group()
 def cli():
@@ -42,6 +47,16 @@ def cli():
     pass
 
 
+def _render_detailed_prices(coin_list, currency):
+    """Fetch one currency's detailed prices and render its warnings and table to a string."""
+    # Capture is per thread, so each worker holds back its own output
+    with console.capture() as capture:
+        result = get_prices_with_change(coin_list, currency, display=False)
+        if result:
+            format_detailed_price_table(result, currency)
+    return capture.get()
+
+
 @cli.command()
 @click.argument('coin_ids', nargs=-1)
 @click.option('--currencies', '-c', default='usd',
@@ -50,18 +65,37 @@ def cli():
               help='Show more detailed information including 24h change')
 def price(coin_ids, currencies, detailed):
     """Get current prices for specific coins."""
-    if not coin_ids:
+    # Accept both "bitcoin ethereum" and "bitcoin,ethereum"; duplicates are
+    # dropped so every coin/currency pair goes out in one batched request
+    coin_list = list(dict.fromkeys(
+        c.strip().lower() for arg in coin_ids for c in arg.split(',') if c.strip()))
+    currencies_list = list(dict.fromkeys(
+        c.strip().lower() for c in currencies.split(',') if c.strip()))
+
+    if not coin_list:
         print_error("Please specify at least one coin ID")
         return
 
-    currencies_list = currencies.split(',')
+    if not currencies_list:
+        print_error("Please specify at least one currency")
+        return
 
     if detailed and len(currencies_list) == 1:
         # If detailed view is requested and only one currency, use markets endpoint
-        get_prices_with_change(list(coin_ids), currencies_list[0])
+        get_prices_with_change(coin_list, currencies_list[0])
+    elif detailed:
+        # The markets endpoint takes one currency per call, so fetch them concurrently
+        # (the api rate limiter still spaces the requests)
+        with ThreadPoolExecutor(max_workers=min(8, len(currencies_list))) as executor:
+            blocks = list(executor.map(
+                lambda currency: _render_detailed_prices(coin_list, currency),
+                currencies_list))
+        # Write every currency's warnings and table in the order given, in a single write
+        console.file.write("".join(blocks))
+        console.file.flush()
     else:
         # Otherwise use simple price endpoint
-        get_current_prices(list(coin_ids), currencies_list)
+        get_current_prices(coin_list, currencies_list)
 
 
 @cli.command()
@@ -106,8 +140,7 @@ def config():
               help='Custom number of days (for custom period)')
 @click.option('--save', '-s', is_flag=True,
               help='Save historical data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def history(coin_id, currency, period, days, save, output):
     """Get historical price data for a specific coin."""
     # Determine the number of days based on period
@@ -169,9 +202,9 @@ def search(query, limit):
               default='7', help='Number of days of data to return')
 @click.option('--save', '-s', is_flag=True,
               help='Save OHLC data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
-def ohlc(coin_id, currency, days, save, output):
+@OUTPUT_OPTION
+@PRETTY_OPTION
+def ohlc(coin_id, currency, days, save, output, pretty):
     """
     Get OHLC (Open, High, Low, Close) chart data for a specific coin.
 
@@ -180,6 +213,7 @@ def ohlc(coin_id, currency, days, save, output):
         CryptoCLI ohlc ethereum --currency eur
         CryptoCLI ohlc solana --days 30
         CryptoCLI ohlc cardano --days 90 --save
+        CryptoCLI ohlc cardano --days 90 --save --pretty
     """
     # Convert days to integer
     days_int = int(days)
@@ -193,7 +227,7 @@ def ohlc(coin_id, currency, days, save, output):
 
     # Save OHLC data if requested
     if save and ohlc_data:
-        save_ohlc_data(ohlc_data, coin_id, currency, days_int, output)
+        save_ohlc_data(ohlc_data, coin_id, currency, days_int, output, pretty=pretty)
 
 
 @cli.command()
@@ -208,8 +242,7 @@ def ohlc(coin_id, currency, days, save, output):
               help='Maximum number of exchange tickers to display')
 @click.option('--save', '-s', is_flag=True,
               help='Save token data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def token(contract_address, platform, currency, tickers, tickers_limit, save, output):
     """
     Get detailed data for a token by contract address.
@@ -253,8 +286,7 @@ def token(contract_address, platform, currency, tickers, tickers_limit, save, ou
               help='Filter platforms by name or ID')
 @click.option('--save', '-s', is_flag=True,
               help='Save platforms data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def platforms(format, query, save, output):
     """
     List all asset platforms (blockchains) supported by CoinGecko.
@@ -285,7 +317,9 @@ def platforms(format, query, save, output):
               help='Save list of supported currencies to a JSON file')
 @click.option('--output', '-o', type=str, default=None,
               help='Filename to save currencies to (requires --save)')
-def currencies(save, output):
+@click.option('--refresh', is_flag=True,
+              help='Bypass the local cache and fetch the list from the API')
+def currencies(save, output, refresh):
     """
     List all supported fiat currencies for price conversions.
 
@@ -293,19 +327,20 @@ def currencies(save, output):
         CryptoCLI currencies
         CryptoCLI currencies --save
         CryptoCLI currencies --save --output currencies.json
+        CryptoCLI currencies --refresh
     """
     get_supported_currencies(
         display=True,
         save=save,
-        output=output
+        output=output,
+        refresh=refresh
     )
 
 
 @cli.command()
 @click.option('--save', '-s', is_flag=True,
               help='Save global market data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def global_data(save, output):
     """
     Show global cryptocurrency market data.
@@ -328,8 +363,7 @@ def global_data(save, output):
 @cli.command()
 @click.option("--save", "-s", is_flag=True,
               help="Save DeFi market data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 @click.option("--top", "-t", type=click.IntRange(1, 100), default=10,
               help="Number of top DeFi tokens to display (1-100)")
 def defi(save, output, top):
@@ -347,51 +381,50 @@ def defi(save, output, top):
               help="Type of trending data to display (coins, nfts, or all)")
 @click.option("--save", "-s", is_flag=True,
               help="Save trending data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
-def trending(type, save, output):
+@OUTPUT_OPTION
+@PRETTY_OPTION
+def trending(type, save, output, pretty):
     """
     Show trending coins or NFTs on CoinGecko in the last 24 hours.
 
     Displays top assets by interest based on CoinGecko's search and trends data.
     """
-    get_trending(data_type=type, display=True, save=save, output=output)
+    get_trending(data_type=type, display=True, save=save, output=output, pretty=pretty)
 
 
 @cli.command()
 @click.option("--save", "-s", is_flag=True,
               help="Save trending coins data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
-def trending_coins(save, output):
+@OUTPUT_OPTION
+@PRETTY_OPTION
+def trending_coins(save, output, pretty):
     """
     Show trending coins on CoinGecko in the last 24 hours.
 
     Displays top coins by interest based on CoinGecko's search and trends data.
     """
-    get_trending_coins(display=True, save=save, output=output)
+    get_trending_coins(display=True, save=save, output=output, pretty=pretty)
 
 
 @cli.command()
 @click.option("--save", "-s", is_flag=True,
               help="Save trending NFTs data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
-def trending_nfts(save, output):
+@OUTPUT_OPTION
+@PRETTY_OPTION
+def trending_nfts(save, output, pretty):
     """
     Show trending NFTs on CoinGecko in the last 24 hours.
 
     Displays top NFT collections by interest based on CoinGecko's search and trends data.
     """
-    get_trending_nfts(display=True, save=save, output=output)
+    get_trending_nfts(display=True, save=save, output=output, pretty=pretty)
 
 
 @cli.command()
 @click.argument('coin_id', type=click.Choice(['bitcoin', 'ethereum']), required=True)
 @click.option("--save", "-s", is_flag=True,
               help="Save companies treasury data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 def companies(coin_id, save, output):
     """
     Show public companies holding Bitcoin or Ethereum in their treasury.
@@ -407,8 +440,7 @@ def companies(coin_id, save, output):
               help="Make a lightweight API call to refresh usage statistics")
 @click.option("--save", "-s", is_flag=True,
               help="Save usage statistics to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 def usage(refresh, save, output):
     """
     Display CoinGecko API usage statistics.
@@ -446,8 +478,7 @@ def usage(refresh, save, output):
               help="Number of gainers and losers to display")
 @click.option("--save", "-s", is_flag=True,
               help="Save gainers and losers data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 def movers(period, currency, limit, save, output):
     """
     Show top cryptocurrency gainers and losers by price change percentage.
@@ -489,8 +520,7 @@ def movers(period, currency, limit, save, output):
               help="Show detailed statistical analysis of newly listed coins")
 @click.option("--save", "-s", is_flag=True,
               help="Save newly listed coins data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 def new_coins(days, currency, limit, analyze, save, output):
     """
     Show recently listed coins on CoinGecko.
@@ -592,8 +622,7 @@ def new_coin_details(coin_id, currency):
               help='End date in YYYY-MM-DD format (e.g., 2023-03-31)')
 @click.option('--save', '-s', is_flag=True,
               help='Save OHLC data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def ohlc_range(coin_id, currency, from_date, to_date, save, output):
     """
     Get OHLC (Open, High, Low, Close) chart data for a specific coin within a date range.
@@ -658,8 +687,7 @@ def ohlc_range(coin_id, currency, from_date, to_date, save, output):
               help='Perform detailed trend analysis of the supply data')
 @click.option('--save', '-s', is_flag=True,
               help='Save supply history data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def supply_history(coin_id, days, analyze, save, output):
     """
     Get historical circulating supply data for a specific coin.
@@ -701,8 +729,7 @@ def supply_history(coin_id, days, analyze, save, output):
               help="Perform analysis on exchange market data")
 @click.option("--save", "-v", is_flag=True,
               help="Save exchanges data to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 def exchanges(limit, filter, sort, analyze, save, output):
     """
     List cryptocurrency exchanges with active trading volumes.
@@ -741,8 +768,7 @@ def exchanges(limit, filter, sort, analyze, save, output):
 @click.argument('exchange_id')
 @click.option("--save", "-s", is_flag=True,
               help="Save exchange details to a JSON file")
-@click.option("--output", "-o", type=str, default=None,
-              help="Filename to save data to (requires --save)")
+@OUTPUT_OPTION
 def exchange_details(exchange_id, save, output):
     """
     Get detailed information about a specific cryptocurrency exchange.
@@ -971,8 +997,7 @@ def exchange_volume(exchange_id, from_date, to_date, from_timestamp, to_timestam
               default='open_interest_btc', help='Sort exchanges by field')
 @click.option('--save', '-v', is_flag=True,
               help='Save derivatives exchanges data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def derivatives_exchanges(limit, filter, sort, save, output):
     """
     List derivatives exchanges with active trading.
@@ -1009,8 +1034,7 @@ def derivatives_exchanges(limit, filter, sort, save, output):
               help='Filter tickers by base/target symbol')
 @click.option('--save', '-s', is_flag=True,
               help='Save derivatives tickers data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def derivatives_tickers(exchange_id, limit, filter, save, output):
     """
     Get tickers from a specific derivatives exchange.
@@ -1045,8 +1069,7 @@ def derivatives_tickers(exchange_id, limit, filter, save, output):
               help='Filter tickers by symbol or exchange')
 @click.option('--save', '-s', is_flag=True,
               help='Save all derivatives tickers data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def all_derivatives_tickers(limit, filter, save, output):
     """
     Get tickers from all derivatives exchanges.
@@ -1077,8 +1100,7 @@ def all_derivatives_tickers(limit, filter, save, output):
 @cli.command()
 @click.option('--limit', '-l', type=int, default=100,
               help='Number of collections to display (max 250)')
-@click.option('--currency', '-c', default='usd',
-              help='Currency to display prices in (e.g., usd, eth)')
+@NFT_CURRENCY_OPTION
 @click.option('--order', '-o',
               type=click.Choice([
                   'h24_volume_native_desc', 'h24_volume_native_asc',
@@ -1090,8 +1112,7 @@ def all_derivatives_tickers(limit, filter, save, output):
               help='Sort order for collections')
 @click.option('--save', '-s', is_flag=True,
               help='Save collections data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def nft_collections(limit, currency, order, save, output):
     """
     List NFT collections with market data.
@@ -1122,12 +1143,10 @@ def nft_collections(limit, currency, order, save, output):
 
 @cli.command()
 @click.argument('collection_id')
-@click.option('--currency', '-c', default='usd',
-              help='Currency to display prices in (e.g., usd, eth)')
+@NFT_CURRENCY_OPTION
 @click.option('--save', '-s', is_flag=True,
               help='Save collection details to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def nft_collection(collection_id, currency, save, output):
     """
     Get detailed information about a specific NFT collection.
@@ -1158,12 +1177,10 @@ def nft_collection(collection_id, currency, save, output):
 @click.argument('collection_id')
 @click.option('--days', '-d', type=int, default=30,
               help='Number of days of historical data (max 365)')
-@click.option('--currency', '-c', default='usd',
-              help='Currency to display prices in (e.g., usd, eth)')
+@NFT_CURRENCY_OPTION
 @click.option('--save', '-s', is_flag=True,
               help='Save historical data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def nft_history(collection_id, days, currency, save, output):
     """
     Get historical market data for an NFT collection.
@@ -1200,12 +1217,10 @@ def nft_history(collection_id, days, currency, save, output):
               help='Blockchain platform the NFT is deployed on')
 @click.option('--days', '-d', type=int, default=30,
               help='Number of days of historical data (max 365)')
-@click.option('--currency', '-c', default='usd',
-              help='Currency to display prices in (e.g., usd, eth)')
+@NFT_CURRENCY_OPTION
 @click.option('--save', '-s', is_flag=True,
               help='Save historical data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def nft_contract_history(contract_address, platform, days, currency, save, output):
     """
     Get historical market data for an NFT collection by contract address.
@@ -1237,12 +1252,10 @@ def nft_contract_history(contract_address, platform, days, currency, save, outpu
 
 @cli.command()
 @click.argument('collection_id')
-@click.option('--currency', '-c', default='usd',
-              help='Currency to display prices in (e.g., usd, eth)')
+@NFT_CURRENCY_OPTION
 @click.option('--save', '-s', is_flag=True,
               help='Save marketplace data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def nft_marketplaces(collection_id, currency, save, output):
     """
     Get marketplace data for an NFT collection by collection ID.
@@ -1276,12 +1289,10 @@ def nft_marketplaces(collection_id, currency, save, output):
               type=click.Choice(['ethereum', 'solana', 'polygon-pos', 'arbitrum-one',
                                 'optimistic-ethereum', 'binance-smart-chain', 'fantom', 'avalanche']),
               help='Blockchain platform the NFT is deployed on')
-@click.option('--currency', '-c', default='usd',
-              help='Currency to display prices in (e.g., usd, eth)')
+@NFT_CURRENCY_OPTION
 @click.option('--save', '-s', is_flag=True,
               help='Save marketplace data to a JSON file')
-@click.option('--output', '-o', type=str, default=None,
-              help='Filename to save data to (requires --save)')
+@OUTPUT_OPTION
 def nft_contract_marketplaces(contract_address, platform, currency, save, output):
     """
     Get marketplace data for an NFT collection by contract address.
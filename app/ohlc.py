@@ -3,13 +3,15 @@ Module for retrieving and displaying OHLC (Open, High, Low, Close) chart data.
 """
 from typing import Dict, List, Any, Tuple, Optional
 from datetime import datetime
+import functools
 import time
+from operator import itemgetter
 from rich.table import Table
 from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
+from rich.style import Style
 from rich.box import Box, MINIMAL
-import json
 import os
 
 from .api import api
@@ -22,10 +24,53 @@ from .utils.formatting import (
     print_warning,
     print_success
 )
+from .utils.serialization import dumps_json
 
 # Valid time periods for OHLC data
 VALID_DAYS = [1, 7, 14, 30, 90, 180, 365]
 
+# Column specs for the OHLC tables, with styles parsed once at import
+_LABEL_STYLE = Style(color="cyan")
+_OHLC_COLUMNS = (
+    ("Date", {"style": _LABEL_STYLE, "justify": "left"}),
+    ("Open", {"justify": "right"}),
+    ("High", {"justify": "right"}),
+    ("Low", {"justify": "right"}),
+    ("Close", {"justify": "right"}),
+    ("Change %", {"justify": "right"}),
+)
+_SUMMARY_COLUMNS = (
+    ("Metric", {"style": _LABEL_STYLE, "justify": "left"}),
+    ("Value", {"justify": "right"}),
+)
+
+# Date formats used by the table, chart axis and saved file
+_TABLE_DATE_FMT = '%Y-%m-%d %H:%M'
+_AXIS_DATE_FMT = '%m-%d'
+_SAVE_DATE_FMT = '%Y-%m-%d %H:%M:%S'
+
+@functools.lru_cache(maxsize=1024)
+def _ohlc_datetime(timestamp: int) -> datetime:
+    """Convert a millisecond timestamp to local time, memoized across the table, chart and save."""
+    # Whole seconds are enough for every format used, so skip the float division
+    return datetime.fromtimestamp(timestamp // 1000)
+
+def _format_ohlc_time(timestamp: float, fmt: str) -> str:
+    """Format a millisecond timestamp in local time with the given strftime format."""
+    return _ohlc_datetime(int(timestamp)).strftime(fmt)
+
+def _ohlc_to_array(ohlc_data: List[List[float]]) -> "np.ndarray":
+    """Convert OHLC points to an (N, 5) float array sorted by timestamp."""
+    import numpy as np
+    
+    arr = np.asarray(ohlc_data, dtype=np.float64)
+    return arr[arr[:, 0].argsort(kind='stable')]
+
+@functools.lru_cache(maxsize=256)
+def _format_axis_price(price: float, currency: str) -> str:
+    """Format a chart axis price, memoized since flat stretches repeat the same labels."""
+    return format_currency(price, currency)
+
 def get_ohlc_data(
     coin_id: str,
     vs_currency: str = 'usd',
@@ -95,44 +140,24 @@ def display_ohlc_data(
     table = Table(title=title_text, box=MINIMAL)
     
     # Add columns for the table
-    table.add_column("Date", style="cyan", justify="left")
-    table.add_column("Open", justify="right")
-    table.add_column("High", justify="right")
-    table.add_column("Low", justify="right")
-    table.add_column("Close", justify="right")
-    table.add_column("Change %", justify="right")
-    
-    # Process data for display
-    formatted_rows = []
-    for data_point in ohlc_data:
-        timestamp = data_point[0]
-        open_price = data_point[1]
-        high_price = data_point[2]
-        low_price = data_point[3]
-        close_price = data_point[4]
-        
+    for header, options in _OHLC_COLUMNS:
+        table.add_column(header, **options)
+    
+    # Sort points by timestamp (oldest to newest) and add each row as it is formatted
+    add_row = table.add_row
+    for timestamp, open_price, high_price, low_price, close_price in sorted(ohlc_data, key=itemgetter(0)):
         # Calculate percentage change
         price_change = ((close_price - open_price) / open_price) * 100
         
-        # Format date
-        date_str = datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M')
-        
-        # Format prices
-        open_str = format_currency(open_price, vs_currency)
-        high_str = format_currency(high_price, vs_currency)
-        low_str = format_currency(low_price, vs_currency)
-        close_str = format_currency(close_price, vs_currency)
-        change_str = format_price_change(price_change)
-        
-        # Add to formatted rows
-        formatted_rows.append((date_str, open_str, high_str, low_str, close_str, change_str))
-    
-    # Sort rows by date (oldest to newest)
-    formatted_rows.sort(key=lambda x: x[0])
-    
-    # Add rows to the table
-    for row in formatted_rows:
-        table.add_row(*row)
+        # Format the date and prices as plain Text so rich does not re-parse them as markup
+        add_row(
+            Text(_format_ohlc_time(timestamp, _TABLE_DATE_FMT)),
+            Text(format_currency(open_price, vs_currency)),
+            Text(format_currency(high_price, vs_currency)),
+            Text(format_currency(low_price, vs_currency)),
+            Text(format_currency(close_price, vs_currency)),
+            format_price_change(price_change)
+        )
     
     # Display the table
     console.print(table)
@@ -159,23 +184,21 @@ def display_ohlc_summary(
     if not ohlc_data or len(ohlc_data) == 0:
         return
     
-    # Extract prices
-    opens = [point[1] for point in ohlc_data]
-    highs = [point[2] for point in ohlc_data]
-    lows = [point[3] for point in ohlc_data]
-    closes = [point[4] for point in ohlc_data]
-    
-    # Calculate statistics
-    avg_open = sum(opens) / len(opens)
-    avg_close = sum(closes) / len(closes)
-    highest = max(highs)
-    lowest = min(lows)
+    # Convert once to a time-sorted 2-D array with columns: timestamp, open, high, low, close
+    arr = _ohlc_to_array(ohlc_data)
+    opens, highs, lows, closes = arr[:, 1], arr[:, 2], arr[:, 3], arr[:, 4]
+    
+    # Calculate statistics as plain floats so formatting skips NumPy's scalar __format__
+    avg_open = float(opens.mean())
+    avg_close = float(closes.mean())
+    highest = float(highs.max())
+    lowest = float(lows.min())
     price_range = highest - lowest
     price_range_pct = (price_range / lowest) * 100
     
     # Get first and last data points
-    first_point = min(ohlc_data, key=lambda x: x[0])
-    last_point = max(ohlc_data, key=lambda x: x[0])
+    first_point = arr[0].tolist()
+    last_point = arr[-1].tolist()
     
     # Calculate overall change
     overall_change = ((last_point[4] - first_point[1]) / first_point[1]) * 100
@@ -184,8 +207,8 @@ def display_ohlc_summary(
     summary = Table(title="OHLC Summary", box=MINIMAL)
     
     # Add columns
-    summary.add_column("Metric", style="cyan", justify="left")
-    summary.add_column("Value", justify="right")
+    for header, options in _SUMMARY_COLUMNS:
+        summary.add_column(header, **options)
     
     # Add rows
     summary.add_row("Starting Price", format_currency(first_point[1], vs_currency))
@@ -221,16 +244,15 @@ def display_ascii_chart(
     if not ohlc_data or len(ohlc_data) == 0:
         return
     
-    # Sort data by timestamp
-    sorted_data = sorted(ohlc_data, key=lambda x: x[0])
+    import numpy as np
     
-    # Extract closing prices and timestamps
-    timestamps = [point[0] for point in sorted_data]
-    close_prices = [point[4] for point in sorted_data]
+    # Sort data by timestamp and extract closing prices
+    arr = _ohlc_to_array(ohlc_data)
+    close_prices = arr[:, 4]
     
     # Find min and max for scaling
-    min_price = min(close_prices)
-    max_price = max(close_prices)
+    min_price = float(close_prices.min())
+    max_price = float(close_prices.max())
     price_range = max_price - min_price
     
     # Avoid division by zero
@@ -245,95 +267,58 @@ def display_ascii_chart(
     chart.append(f"Range: {format_currency(min_price, vs_currency)} - {format_currency(max_price, vs_currency)}")
     chart.append("")
     
-    # Create y-axis labels
-    y_labels = []
-    for i in range(height):
-        # Calculate price at this height
-        price = max_price - (i * price_range / (height - 1))
-        # Format the label
-        label = format_currency(price, vs_currency)
-        # Add to labels
-        y_labels.append(label)
-    
-    # Calculate x positions for each data point
-    num_points = len(close_prices)
-    x_positions = []
-    
-    for i in range(num_points):
-        # Calculate position along the width
-        pos = int((i / (num_points - 1)) * (width - 1)) if num_points > 1 else 0
-        x_positions.append(pos)
-    
-    # Calculate y positions for each data point
-    y_positions = []
+    # Create y-axis labels, one evenly spaced price per chart row
+    y_prices = np.linspace(max_price, max_price - price_range, height)
+    y_labels = [_format_axis_price(round(float(price), 6), vs_currency) for price in y_prices]
     
-    for price in close_prices:
-        # Scale the price to chart height
-        pos = int(((max_price - price) / price_range) * (height - 1)) if price_range > 0 else 0
-        y_positions.append(pos)
+    # Calculate x positions for each data point along the width
+    num_points = len(close_prices)
+    if num_points > 1:
+        x_positions = (np.arange(num_points) / (num_points - 1) * (width - 1)).astype(np.intp)
+    else:
+        x_positions = np.zeros(num_points, dtype=np.intp)
     
-    # Create the chart grid with spaces
-    grid = [[' ' for _ in range(width)] for _ in range(height)]
+    # Calculate y positions by scaling each price to the chart height
+    y_positions = ((max_price - close_prices) / price_range * (height - 1)).astype(np.intp)
     
-    # Plot the line
-    for i in range(num_points):
-        x = x_positions[i]
-        y = y_positions[i]
-        
-        # Ensure we're within bounds
-        if 0 <= y < height and 0 <= x < width:
-            grid[y][x] = '●'
+    # Create the chart grid as one contiguous block of characters and plot the data points
+    grid = np.full((height, width), ' ', dtype='<U1')
+    grid[y_positions, x_positions] = '●'
     
-    # Connect points with lines
+    # Connect points with lines, rasterizing each segment in one vectorized write
     for i in range(1, num_points):
         x1, y1 = x_positions[i-1], y_positions[i-1]
         x2, y2 = x_positions[i], y_positions[i]
         
-        # Draw a line between the points
+        # Choose the line character from the segment direction
         if x1 == x2:
-            # Vertical line
-            start, end = min(y1, y2), max(y1, y2)
-            for y in range(start + 1, end):
-                if 0 <= y < height and 0 <= x1 < width:
-                    if grid[y][x1] == ' ':
-                        grid[y][x1] = '│'
+            char = '│'
         elif y1 == y2:
-            # Horizontal line
-            start, end = min(x1, x2), max(x1, x2)
-            for x in range(start + 1, end):
-                if 0 <= y1 < height and 0 <= x < width:
-                    if grid[y1][x] == ' ':
-                        grid[y1][x] = '─'
+            char = '─'
+        elif (x2 - x1) * (y2 - y1) < 0:
+            char = '/'
         else:
-            # Diagonal line
-            dx = abs(x2 - x1)
-            dy = abs(y2 - y1)
-            sx = 1 if x1 < x2 else -1
-            sy = 1 if y1 < y2 else -1
-            err = dx - dy
-            
-            while (x1 != x2 or y1 != y2):
-                if 0 <= y1 < height and 0 <= x1 < width:
-                    if grid[y1][x1] == ' ':
-                        # Choose the appropriate character for diagonal lines
-                        if (sx > 0 and sy < 0) or (sx < 0 and sy > 0):
-                            grid[y1][x1] = '/'
-                        else:
-                            grid[y1][x1] = '\\'
-                
-                e2 = 2 * err
-                if e2 > -dy:
-                    err -= dy
-                    x1 += sx
-                if e2 < dx:
-                    err += dx
-                    y1 += sy
-    
-    # Convert grid to strings and add y-axis labels
-    for i, row in enumerate(grid):
-        label_str = y_labels[i].ljust(10)  # Pad the label to a fixed width
-        line = label_str + ''.join(row)
-        chart.append(line)
+            char = '\\'
+        
+        # Bresenham's cells in closed form: the major axis advances every step and
+        # the minor offset is rounded with ties toward the segment's start
+        dx, dy = abs(x2 - x1), abs(y2 - y1)
+        steps = max(dx, dy)
+        if steps == 0:
+            continue
+        k = np.arange(steps + 1)
+        minor = (2 * k * min(dx, dy) + steps - 1) // (2 * steps)
+        off_x, off_y = (k, minor) if dx >= dy else (minor, k)
+        xs = x1 + np.sign(x2 - x1) * off_x
+        ys = y1 + np.sign(y2 - y1) * off_y
+        
+        # Only draw into empty cells so points and earlier segments are kept
+        free = grid[ys, xs] == ' '
+        grid[ys[free], xs[free]] = char
+    
+    # Reinterpret each grid row as a single string (no per-cell objects) and add y-axis labels
+    for label, row in zip(y_labels, grid.view(f'<U{width}').ravel().tolist()):
+        chart.append(label.ljust(10) + row)  # Pad the label to a fixed width
     
     # Add x-axis with timestamps
     chart.append('-' * (width + 10))  # Line under the chart
@@ -343,10 +328,10 @@ def display_ascii_chart(
     x_labels = []
     
     for idx in label_indices:
-        # Format the date
-        date_str = datetime.fromtimestamp(timestamps[idx] / 1000).strftime('%m-%d')
+        # Format the date, converting only the labelled timestamps
+        date_str = _format_ohlc_time(int(arr[idx, 0]), _AXIS_DATE_FMT)
         # Calculate position
-        pos = x_positions[idx] + 10  # Add offset for y-axis labels
+        pos = int(x_positions[idx]) + 10  # Add offset for y-axis labels
         # Add to labels with position
         x_labels.append((pos, date_str))
     
@@ -364,12 +349,25 @@ def display_ascii_chart(
     console.print('\n'.join(chart))
     console.print("")  # Add empty line at the end
 
+def _ohlc_save_point(point: List[float]) -> Dict[str, Any]:
+    """Convert one raw OHLC point to the record written to the save file."""
+    timestamp = point[0]
+    return {
+        "timestamp": timestamp,
+        "date": _format_ohlc_time(timestamp, _SAVE_DATE_FMT),
+        "open": point[1],
+        "high": point[2],
+        "low": point[3],
+        "close": point[4]
+    }
+
 def save_ohlc_data(
     ohlc_data: List[List[float]],
     coin_id: str,
     vs_currency: str,
     days: int,
-    filename: Optional[str] = None
+    filename: Optional[str] = None,
+    pretty: bool = False
 ) -> str:
     """
     Save OHLC data to a JSON file.
@@ -380,6 +378,7 @@ def save_ohlc_data(
         vs_currency: Currency used for the data
         days: Number of days of data
         filename: Optional filename to save to
+        pretty: Whether to indent the whole file (one point per line by default)
         
     Returns:
         Path to the saved file
@@ -394,37 +393,29 @@ def save_ohlc_data(
         filename = f"{coin_id}_{vs_currency}_ohlc_{days}d_{timestamp}.json"
     
     try:
-        # Convert the data to a more readable format
-        formatted_data = []
-        
-        for point in ohlc_data:
-            timestamp = point[0]
-            date_str = datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
-            
-            formatted_point = {
-                "timestamp": timestamp,
-                "date": date_str,
-                "open": point[1],
-                "high": point[2],
-                "low": point[3],
-                "close": point[4]
-            }
-            
-            formatted_data.append(formatted_point)
-        
-        # Create a data object with metadata
-        data_object = {
+        metadata = {
             "coin_id": coin_id,
             "currency": vs_currency,
             "days": days,
             "data_points": len(ohlc_data),
-            "generated_at": int(time.time()),
-            "ohlc_data": formatted_data
+            "generated_at": int(time.time())
         }
         
-        # Write to file
-        with open(filename, 'w') as f:
-            json.dump(data_object, f, indent=4)
+        with open(filename, 'wb') as f:
+            if pretty:
+                # Indenting needs the whole document, so build the point list up front
+                metadata["ohlc_data"] = [_ohlc_save_point(point) for point in ohlc_data]
+                f.write(dumps_json(metadata, pretty=True))
+            else:
+                # Stream each point straight to the file instead of building a full list;
+                # the metadata's closing brace is reopened for the rows
+                f.write(dumps_json(metadata)[:-1] + b',"ohlc_data":[')
+                separator = b'\n'
+                for point in ohlc_data:
+                    f.write(separator)
+                    f.write(dumps_json(_ohlc_save_point(point)))
+                    separator = b',\n'
+                f.write(b'\n]}\n')
             
         print_success(f"OHLC data saved to {filename}")
         return filename
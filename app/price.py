@@ -2,8 +2,6 @@
 Module for retrieving and displaying cryptocurrency price information.
 """
 from typing import Dict, List
-from rich.table import Table
-from rich.console import Console
 from .api import api
 from .utils.formatting import (
     console, 
@@ -11,9 +9,26 @@ from .utils.formatting import (
     format_large_number,
     format_price_change,
     print_error, 
+    print_plain_table,
     print_warning
 )
 
+# Bound price formatters keyed by lowercase currency code
+_SYMBOL_FMT = {
+    'usd': "${:,.2f}".format,
+    'eur': "€{:,.2f}".format,
+    'gbp': "£{:,.2f}".format,
+}
+_CURRENCY_FMT = {
+    **_SYMBOL_FMT,
+    'btc': "{:.8f}".format,
+    'eth': "{:.8f}".format,
+    'ltc': "{:.8f}".format,
+}
+_DEFAULT_FMT = "{:,.4f}".format
+
+_DETAILED_HEADERS = ["Rank", "Coin", "Symbol", "Price", "24h Change", "Market Cap", "Volume (24h)"]
+
 def format_price_table(price_data: Dict[str, Dict[str, float]], currencies: List[str]) -> None:
     """
     Format and display price data for multiple cryptocurrencies in a table.
@@ -26,7 +41,27 @@ def format_price_table(price_data: Dict[str, Dict[str, float]], currencies: List
         print_warning("No price data found for the specified coins.")
         return
     
-    table = Table(title="Current Cryptocurrency Prices")
+    title = "Current Cryptocurrency Prices"
+    
+    # Pick each column's price format once rather than per cell
+    col_fmts = [(currency, _CURRENCY_FMT.get(currency.lower(), _DEFAULT_FMT)) for currency in currencies]
+    
+    # Build rows for each coin
+    rows = []
+    for coin_id, prices in sorted(price_data.items()):
+        row = [coin_id]
+        for currency, fmt in col_fmts:
+            row.append(fmt(prices[currency]) if currency in prices else "N/A")
+        rows.append(row)
+    
+    # Skip rich's table layout when output is piped or redirected
+    if not console.is_terminal:
+        print_plain_table(title, ["Coin", *(currency.upper() for currency in currencies)], rows, target=console)
+        return
+    
+    from rich.table import Table
+    
+    table = Table(title=title)
     
     # Add columns for the table
     table.add_column("Coin", style="cyan", justify="left")
@@ -34,30 +69,17 @@ def format_price_table(price_data: Dict[str, Dict[str, float]], currencies: List
         table.add_column(currency.upper(), justify="right")
     
     # Add rows for each coin
-    for coin_id, prices in sorted(price_data.items()):
-        row = [coin_id]
-        for currency in currencies:
-            if currency in prices:
-                # Format the price based on the currency
-                price = prices[currency]
-                if currency.lower() == 'usd':
-                    row.append(f"${price:,.2f}")
-                elif currency.lower() == 'eur':
-                    row.append(f"€{price:,.2f}")
-                elif currency.lower() == 'gbp':
-                    row.append(f"£{price:,.2f}")
-                elif currency.lower() in ['btc', 'eth', 'ltc']:
-                    row.append(f"{price:.8f}")
-                else:
-                    row.append(f"{price:,.4f}")
-            else:
-                row.append("N/A")
-        
+    for row in rows:
         table.add_row(*row)
     
     # Display the table
     console.print(table)
 
+def _rank_sort_key(item) -> float:
+    """Sort key for (coin_id, data) pairs by market cap rank, with unranked coins last."""
+    rank = item[1].get("market_cap_rank")
+    return rank if rank is not None else float("inf")
+
 def format_detailed_price_table(price_data: Dict[str, Dict[str, float]], currency: str) -> None:
     """
     Format and display detailed price data with change percentages in a table.
@@ -70,7 +92,39 @@ def format_detailed_price_table(price_data: Dict[str, Dict[str, float]], currenc
         print_warning("No price data found for the specified coins.")
         return
     
-    table = Table(title=f"Cryptocurrency Prices and Market Data (in {currency.upper()})")
+    title = f"Cryptocurrency Prices and Market Data (in {currency.upper()})"
+    
+    # Pick the price format once for the whole table
+    price_fmt = _SYMBOL_FMT.get(currency.lower()) or ("{:,.4f} " + currency.upper()).format
+    
+    # Per-currency field names are the same for every row
+    change_key = f"{currency}_24h_change"
+    market_cap_key = f"{currency}_market_cap"
+    volume_key = f"{currency}_volume"
+    
+    # Sort by market cap rank (unranked coins last) and format every cell up front
+    ranked = sorted(price_data.items(), key=_rank_sort_key)
+    rows = [
+        (
+            f"#{rank}" if (rank := data.get("market_cap_rank")) is not None else "N/A",
+            data.get("name", coin_id),
+            data.get("symbol", "").upper(),
+            price_fmt(data.get(currency, 0)),
+            format_price_change(data.get(change_key, 0)),
+            format_large_number(data.get(market_cap_key, 0)),
+            format_large_number(data.get(volume_key, 0))
+        )
+        for coin_id, data in ranked
+    ]
+    
+    # Skip rich's table layout when output is piped or redirected
+    if not console.is_terminal:
+        print_plain_table(title, _DETAILED_HEADERS, rows, target=console)
+        return
+    
+    from rich.table import Table
+    
+    table = Table(title=title)
     
     # Define columns
     table.add_column("Rank", justify="right", style="dim")
@@ -81,53 +135,9 @@ def format_detailed_price_table(price_data: Dict[str, Dict[str, float]], currenc
     table.add_column("Market Cap", justify="right")
     table.add_column("Volume (24h)", justify="right")
     
-    # Prepare data for sorting by rank
-    coin_data = []
-    for coin_id, data in price_data.items():
-        price = data.get(currency, 0)
-        price_change = data.get(f"{currency}_24h_change", 0)
-        market_cap = data.get(f"{currency}_market_cap", 0)
-        volume = data.get(f"{currency}_volume", 0)
-        market_cap_rank = data.get("market_cap_rank", 999999)  # Default high rank for sorting
-        symbol = data.get("symbol", "").upper()
-        name = data.get("name", coin_id)
-        
-        coin_data.append({
-            "id": coin_id,
-            "name": name,
-            "symbol": symbol,
-            "price": price,
-            "price_change": price_change,
-            "market_cap": market_cap,
-            "volume": volume,
-            "rank": market_cap_rank
-        })
-    
-    # Sort by market cap rank
-    coin_data.sort(key=lambda x: x["rank"])
-    
     # Add rows to the table
-    for coin in coin_data:
-        # Format price based on currency
-        if currency.lower() == 'usd':
-            price_str = f"${coin['price']:,.2f}"
-        elif currency.lower() == 'eur':
-            price_str = f"€{coin['price']:,.2f}"
-        elif currency.lower() == 'gbp':
-            price_str = f"£{coin['price']:,.2f}"
-        else:
-            price_str = f"{coin['price']:,.4f} {currency.upper()}"
-        
-        # Add the row with all data
-        table.add_row(
-            f"#{coin['rank']}" if coin['rank'] != 999999 else "N/A",
-            coin['name'],
-            coin['symbol'],
-            price_str,
-            format_price_change(coin['price_change']),
-            format_large_number(coin['market_cap']),
-            format_large_number(coin['volume'])
-        )
+    for row in rows:
+        table.add_row(*row)
     
     # Display the table
     console.print(table)
@@ -157,13 +167,14 @@ def get_current_prices(coin_ids: List[str], currencies: List[str], display: bool
         print_error(f"Failed to fetch price data: {str(e)}")
         return {}
 
-def get_prices_with_change(coin_ids: List[str], vs_currency: str = 'usd') -> Dict[str, Dict[str, float]]:
+def get_prices_with_change(coin_ids: List[str], vs_currency: str = 'usd', display: bool = True) -> Dict[str, Dict[str, float]]:
     """
     Get current prices for multiple cryptocurrencies with price change percentages.
     
     Args:
         coin_ids: List of coin IDs (e.g., ['bitcoin', 'ethereum'])
         vs_currency: Currency to get price data in
+        display: Whether to display the results
         
     Returns:
         Dictionary with detailed price information including change percentages
@@ -177,32 +188,34 @@ def get_prices_with_change(coin_ids: List[str], vs_currency: str = 'usd') -> Dic
             page=1
         )
         
-        # Filter to only get the requested coins
+        # Keep only the requested coins, transforming them in the same pass to a
+        # similar format as the simple price endpoint but with more details
         requested_coins = set(coin_ids)
-        filtered_data = [coin for coin in markets_data if coin['id'] in requested_coins]
-        
-        # Ensure all requested coins are included by checking which ones are missing
-        found_coins = {coin['id'] for coin in filtered_data}
-        missing_coins = requested_coins - found_coins
-        
-        if missing_coins:
-            console.print(f"[yellow]Warning:[/yellow] Could not find detailed data for: {', '.join(missing_coins)}")
-        
-        # Transform to a similar format as the simple price endpoint but with more details
-        result = {}
-        for coin in filtered_data:
-            result[coin['id']] = {
+        change_key = f"{vs_currency}_24h_change"
+        market_cap_key = f"{vs_currency}_market_cap"
+        volume_key = f"{vs_currency}_volume"
+        result = {
+            coin['id']: {
                 vs_currency: coin['current_price'],
-                f"{vs_currency}_24h_change": coin.get('price_change_percentage_24h', 0),
-                f"{vs_currency}_market_cap": coin.get('market_cap', 0),
-                f"{vs_currency}_volume": coin.get('total_volume', 0),
-                "market_cap_rank": coin.get('market_cap_rank', 0),
+                change_key: coin.get('price_change_percentage_24h', 0),
+                market_cap_key: coin.get('market_cap', 0),
+                volume_key: coin.get('total_volume', 0),
+                "market_cap_rank": coin.get('market_cap_rank'),
                 "symbol": coin.get('symbol', ''),
                 "name": coin.get('name', coin['id'])
             }
+            for coin in markets_data
+            if coin['id'] in requested_coins
+        }
         
-        # Display the results in a table
-        format_detailed_price_table(result, vs_currency)
+        # Report any requested coins the markets endpoint did not return
+        missing_coins = requested_coins - result.keys()
+        if missing_coins:
+            console.print(f"[yellow]Warning:[/yellow] Could not find detailed data for: {', '.join(missing_coins)}")
+        
+        # Display the results in a table if requested
+        if display:
+            format_detailed_price_table(result, vs_currency)
             
         return result
     except Exception as e:
@@ -1,175 +1,9 @@
-"""
-Functionality for retrieving and displaying trending coins from CoinGecko.
-"""
-from typing import Dict, Any, List, Optional
-import json
-from datetime import datetime
-import os
-
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich.console import Console
-
-from app.api import api
-from app.utils.formatting import (
-    console, 
-    print_error, 
-    print_warning,
-    format_currency, 
-    format_large_number,
-    format_percentage
-)
-
-def get_trending_coins(display=True, save=False, output=None):
-    """
-    Get and display trending cryptocurrencies in the last 24 hours.
-    
-    Args:
-        display (bool): Whether to display the data in the console
-        save (bool): Whether to save the data to a file
-        output (str, optional): Filename to save data to (if save is True)
-        
-    Returns:
-        dict: Trending coins data or None if an error occurs
-    """
-    try:
-        # Get trending coins from API
-        trending_data = api.get_trending_coins()
-        
-        # Check if we have a valid response with coins data
-        if not trending_data or 'coins' not in trending_data:
-            print_error("Failed to get trending coins data from CoinGecko API.")
-            return None
-        
-        # Display the data if requested
-        if display:
-            display_trending_coins(trending_data)
-        
-        # Save the data if requested
-        if save:
-            file_path = save_trending_data(trending_data, output)
-            console.print(f"\n[green]Trending coins data saved to:[/green] {file_path}")
-        
-        return trending_data
-    
-    except Exception as e:
-        print_error(f"Error retrieving trending coins: {str(e)}")
-        return None
-
-def display_trending_coins(trending_data: Dict[str, Any]):
-    """
-    Display trending cryptocurrencies in a formatted table.
-    
-    Args:
-        trending_data (dict): Trending coins data from the API
-    """
-    # Check if we have coins to display
-    if not trending_data or 'coins' not in trending_data or not trending_data['coins']:
-        print_warning("No trending coins found.")
-        return
-    
-    coins = trending_data['coins']
-    
-    # Create a header text
-    header_text = Text("\n[bold]🔥 Trending coins on CoinGecko in the last 24 hours[/bold]\n")
-    console.print(header_text)
-    
-    # Create a table for trending coins
-    table = Table(title="CoinGecko Trending Coins")
-    
-    # Define table columns
-    table.add_column("#", style="dim", justify="right")
-    table.add_column("Name", style="cyan")
-    table.add_column("Symbol", style="blue")
-    table.add_column("Market Cap Rank", justify="right")
-    table.add_column("BTC Price", justify="right")
-    table.add_column("Score", justify="right")
-    
-    # Add rows to the table
-    for i, coin_data in enumerate(coins, 1):
-        # Get the item data
-        item = coin_data.get('item', {})
-        
-        # Get the relevant data fields
-        name = item.get('name', 'Unknown')
-        symbol = item.get('symbol', '?').upper()
-        market_cap_rank = str(item.get('market_cap_rank', 'N/A'))
-        
-        # Format the price in BTC if available
-        btc_price = item.get('price_btc')
-        if btc_price is not None:
-            try:
-                btc_price_formatted = f"₿ {float(btc_price):.8f}"
-            except (ValueError, TypeError):
-                btc_price_formatted = "N/A"
-        else:
-            btc_price_formatted = "N/A"
-            
-        # Get the score
-        score = item.get('score')
-        if score is not None:
-            try:
-                score_formatted = f"{int(score) + 1}"  # Add 1 as the scores are 0-based
-            except (ValueError, TypeError):
-                score_formatted = str(score)
-        else:
-            score_formatted = "N/A"
-        
-        # Add the row to the table
-        table.add_row(
-            str(i),
-            name,
-            symbol,
-            market_cap_rank,
-            btc_price_formatted,
-            score_formatted
-        )
-    
-    # Print the table
-    console.print(table)
-    
-    # Display the last update time if available
-    if 'updated_at' in trending_data:
-        try:
-            timestamp = trending_data['updated_at']
-            dt = datetime.fromtimestamp(timestamp)
-            time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-            console.print(f"\n[dim]Last updated: {time_str}[/dim]")
-        except (TypeError, ValueError):
-            pass
-
-def save_trending_data(data: Dict[str, Any], filename: Optional[str] = None) -> str:
-    """
-    Save trending coins data to a JSON file.
-    
-    Args:
-        data (dict): Trending coins data
-        filename (str, optional): Filename to save data to
-        
-    Returns:
-        str: Path to the saved file
-    """
-    if not filename:
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        filename = f"trending_coins_{timestamp}.json"
-    
-    # Ensure the filename has a .json extension
-    if not filename.endswith('.json'):
-        filename += '.json'
-    
-    # Write data to file
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
-    
-    return os.path.abspath(filename)
-
 """
 Functionality for retrieving and displaying trending coins and NFTs from CoinGecko.
 """
 from typing import Dict, Any, List, Optional, Literal
-import json
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
 
 from rich.table import Table
@@ -184,12 +18,49 @@ from .utils.formatting import (
     print_warning,
     format_currency, 
     format_large_number,
-    format_percentage
+    format_percentage,
+    print_plain_table,
+    row_indices
 )
+from .utils.serialization import dumps_json
 
 TrendingType = Literal["coins", "nfts", "all"]
 
-def get_trending(data_type: TrendingType = "coins", display=True, save=False, output=None):
+_COIN_TITLE = "CoinGecko Trending Coins"
+_NFT_TITLE = "CoinGecko Trending NFTs"
+
+# Column definitions for the trending tables, built once at import time
+_COIN_COLUMNS = (
+    ("#", {"style": "dim", "justify": "right"}),
+    ("Name", {"style": "cyan"}),
+    ("Symbol", {"style": "blue"}),
+    ("Market Cap Rank", {"justify": "right"}),
+    ("BTC Price", {"justify": "right"}),
+    ("Score", {"justify": "right"}),
+)
+_NFT_COLUMNS = (
+    ("#", {"style": "dim", "justify": "right"}),
+    ("Name", {"style": "cyan"}),
+    ("Symbol", {"style": "blue"}),
+    ("Floor Price (ETH)", {"justify": "right"}),
+    ("24h Volume", {"justify": "right"}),
+    ("Market Cap", {"justify": "right"}),
+    ("Score", {"justify": "right"}),
+)
+
+# Bound format methods for the per-row price cells
+_BTC_FMT = "₿ {:.8f}".format
+_ETH_FMT = "Ξ {:.4f}".format
+
+# Below this many rows the per-item conversions are cheaper than building arrays
+_VECTORIZE_MIN_ROWS = 20
+
+# Scores are shifted by one in int64, so only values below the int64 maximum
+# can take the vectorized path; larger ones are formatted as Python ints
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+def get_trending(data_type: TrendingType = "coins", display=True, save=False, output=None, pretty=False):
     """
     Get and display trending cryptocurrencies or NFTs in the last 24 hours.
     
@@ -198,17 +69,25 @@ def get_trending(data_type: TrendingType = "coins", display=True, save=False, ou
         display (bool): Whether to display the data in the console
         save (bool): Whether to save the data to a file
         output (str, optional): Filename to save data to (if save is True)
+        pretty (bool): Whether to indent the saved JSON file
         
     Returns:
         dict: Trending data or None if an error occurs
     """
     try:
         trending_data = {}
+        coins_future = nfts_future = None
+        
+        # The coins and NFTs requests are independent, so overlap them when both are needed
+        if data_type == "all":
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                coins_future = executor.submit(api.get_trending_coins)
+                nfts_future = executor.submit(api.get_trending_nfts)
         
         # Get trending coins if requested
         if data_type in ["coins", "all"]:
             try:
-                coins_data = api.get_trending_coins()
+                coins_data = coins_future.result() if coins_future else api.get_trending_coins()
                 if coins_data and 'coins' in coins_data:
                     trending_data['coins'] = coins_data['coins']
                     if 'updated_at' in coins_data:
@@ -220,7 +99,7 @@ def get_trending(data_type: TrendingType = "coins", display=True, save=False, ou
         # Get trending NFTs if requested
         if data_type in ["nfts", "all"]:
             try:
-                nfts_data = api.get_trending_nfts()
+                nfts_data = nfts_future.result() if nfts_future else api.get_trending_nfts()
                 if nfts_data and 'nfts' in nfts_data:
                     trending_data['nfts'] = nfts_data['nfts']
                     if 'updated_at' in nfts_data and 'updated_at' not in trending_data:
@@ -239,7 +118,7 @@ def get_trending(data_type: TrendingType = "coins", display=True, save=False, ou
         
         # Save data if requested
         if save:
-            file_path = save_trending_data(trending_data, data_type, output)
+            file_path = save_trending_data(trending_data, data_type, output, pretty=pretty)
             console.print(f"\n[green]Trending {data_type} data saved to:[/green] {file_path}")
         
         return trending_data
@@ -248,7 +127,7 @@ def get_trending(data_type: TrendingType = "coins", display=True, save=False, ou
         print_error(f"Error retrieving trending data: {str(e)}")
         return None
 
-def get_trending_coins(display=True, save=False, output=None):
+def get_trending_coins(display=True, save=False, output=None, pretty=False):
     """
     Get and display trending cryptocurrencies in the last 24 hours.
     
@@ -256,13 +135,14 @@ def get_trending_coins(display=True, save=False, output=None):
         display (bool): Whether to display the data in the console
         save (bool): Whether to save the data to a file
         output (str, optional): Filename to save data to (if save is True)
+        pretty (bool): Whether to indent the saved JSON file
         
     Returns:
         dict: Trending coins data or None if an error occurs
     """
-    return get_trending("coins", display, save, output)
+    return get_trending("coins", display, save, output, pretty)
 
-def get_trending_nfts(display=True, save=False, output=None):
+def get_trending_nfts(display=True, save=False, output=None, pretty=False):
     """
     Get and display trending NFTs in the last 24 hours.
     
@@ -270,11 +150,12 @@ def get_trending_nfts(display=True, save=False, output=None):
         display (bool): Whether to display the data in the console
         save (bool): Whether to save the data to a file
         output (str, optional): Filename to save data to (if save is True)
+        pretty (bool): Whether to indent the saved JSON file
         
     Returns:
         dict: Trending NFTs data or None if an error occurs
     """
-    return get_trending("nfts", display, save, output)
+    return get_trending("nfts", display, save, output, pretty)
 
 def display_trending_coins(trending_data: Dict[str, Any]):
     """
@@ -290,60 +171,48 @@ def display_trending_coins(trending_data: Dict[str, Any]):
     
     coins = trending_data['coins']
     
-    # Create a header text
-    header_text = Text("\n[bold]🔥 Trending coins on CoinGecko in the last 24 hours[/bold]\n")
-    console.print(header_text)
-    
-    # Create a table for trending coins
-    table = Table(title="CoinGecko Trending Coins")
-    
-    # Define table columns
-    table.add_column("#", style="dim", justify="right")
-    table.add_column("Name", style="cyan")
-    table.add_column("Symbol", style="blue")
-    table.add_column("Market Cap Rank", justify="right")
-    table.add_column("BTC Price", justify="right")
-    table.add_column("Score", justify="right")
+    # Format the numeric columns in one pass over the items
+    items = [coin_data.get('item', {}) for coin_data in coins]
+    btc_prices = _format_btc_prices([item.get('price_btc') for item in items])
+    scores = _format_scores([item.get('score') for item in items])
     
-    # Add rows to the table
-    for i, coin_data in enumerate(coins, 1):
-        # Get the item data
-        item = coin_data.get('item', {})
-        
+    # Build the table rows
+    rows = []
+    for index, item, btc_price_formatted, score_formatted in zip(row_indices(len(items)), items, btc_prices, scores):
         # Get the relevant data fields
         name = item.get('name', 'Unknown')
         symbol = item.get('symbol', '?').upper()
         market_cap_rank = str(item.get('market_cap_rank', 'N/A'))
         
-        # Format the price in BTC if available
-        btc_price = item.get('price_btc')
-        if btc_price is not None:
-            try:
-                btc_price_formatted = f"₿ {float(btc_price):.8f}"
-            except (ValueError, TypeError):
-                btc_price_formatted = "N/A"
-        else:
-            btc_price_formatted = "N/A"
-            
-        # Get the score
-        score = item.get('score')
-        if score is not None:
-            try:
-                score_formatted = f"{int(score) + 1}"  # Add 1 as the scores are 0-based
-            except (ValueError, TypeError):
-                score_formatted = str(score)
-        else:
-            score_formatted = "N/A"
-        
-        # Add the row to the table
-        table.add_row(
-            str(i),
+        rows.append((
+            index,
             name,
             symbol,
             market_cap_rank,
             btc_price_formatted,
             score_formatted
-        )
+        ))
+    
+    # Skip Rich's layout engine entirely when output is redirected
+    if not console.is_terminal:
+        print_plain_table(_COIN_TITLE, [header for header, _ in _COIN_COLUMNS], rows, target=console)
+        display_update_time(trending_data)
+        return
+    
+    # Create a header text
+    header_text = Text("\n[bold]🔥 Trending coins on CoinGecko in the last 24 hours[/bold]\n")
+    console.print(header_text)
+    
+    # Create a table for trending coins
+    table = Table(title=_COIN_TITLE)
+    
+    # Define table columns
+    for header, options in _COIN_COLUMNS:
+        table.add_column(header, **options)
+    
+    # Add rows to the table
+    for row in rows:
+        table.add_row(*row)
     
     # Print the table
     console.print(table)
@@ -365,24 +234,9 @@ def display_trending_nfts(trending_data: Dict[str, Any]):
     
     nfts = trending_data['nfts']
     
-    # Create a header text
-    header_text = Text("\n[bold]🖼️ Trending NFTs on CoinGecko in the last 24 hours[/bold]\n")
-    console.print(header_text)
-    
-    # Create a table for trending NFTs
-    table = Table(title="CoinGecko Trending NFTs")
-    
-    # Define table columns
-    table.add_column("#", style="dim", justify="right")
-    table.add_column("Name", style="cyan")
-    table.add_column("Symbol", style="blue")
-    table.add_column("Floor Price (ETH)", justify="right")
-    table.add_column("24h Volume", justify="right")
-    table.add_column("Market Cap", justify="right")
-    table.add_column("Score", justify="right")
-    
-    # Add rows to the table
-    for i, nft_data in enumerate(nfts, 1):
+    # Build the table rows
+    rows = []
+    for index, nft_data in zip(row_indices(len(nfts)), nfts):
         # Get the item data
         item = nft_data.get('item', {})
         
@@ -394,7 +248,7 @@ def display_trending_nfts(trending_data: Dict[str, Any]):
         floor_price = item.get('floor_price_in_eth')
         if floor_price is not None:
             try:
-                floor_price_formatted = f"Ξ {float(floor_price):.4f}"
+                floor_price_formatted = _ETH_FMT(float(floor_price))
             except (ValueError, TypeError):
                 floor_price_formatted = "N/A"
         else:
@@ -409,25 +263,38 @@ def display_trending_nfts(trending_data: Dict[str, Any]):
         market_cap_formatted = format_currency(market_cap, 'USD') if market_cap else "N/A"
             
         # Get the score
-        score = item.get('score')
-        if score is not None:
-            try:
-                score_formatted = f"{int(score) + 1}"  # Add 1 as the scores are 0-based
-            except (ValueError, TypeError):
-                score_formatted = str(score)
-        else:
-            score_formatted = "N/A"
+        score_formatted = _format_score(item.get('score'))
         
-        # Add the row to the table
-        table.add_row(
-            str(i),
+        rows.append((
+            index,
             name,
             symbol,
             floor_price_formatted,
             volume_formatted,
             market_cap_formatted,
             score_formatted
-        )
+        ))
+    
+    # Skip Rich's layout engine entirely when output is redirected
+    if not console.is_terminal:
+        print_plain_table(_NFT_TITLE, [header for header, _ in _NFT_COLUMNS], rows, target=console)
+        display_update_time(trending_data)
+        return
+    
+    # Create a header text
+    header_text = Text("\n[bold]🖼️ Trending NFTs on CoinGecko in the last 24 hours[/bold]\n")
+    console.print(header_text)
+    
+    # Create a table for trending NFTs
+    table = Table(title=_NFT_TITLE)
+    
+    # Define table columns
+    for header, options in _NFT_COLUMNS:
+        table.add_column(header, **options)
+    
+    # Add rows to the table
+    for row in rows:
+        table.add_row(*row)
     
     # Print the table
     console.print(table)
@@ -435,18 +302,68 @@ def display_trending_nfts(trending_data: Dict[str, Any]):
     # Display the last update time if available
     display_update_time(trending_data)
 
+def _format_btc_price(btc_price: Any) -> str:
+    """Format a single BTC price, falling back to N/A for missing values."""
+    if btc_price is None:
+        return "N/A"
+    try:
+        return _BTC_FMT(float(btc_price))
+    except (ValueError, TypeError):
+        return "N/A"
+
+def _format_score(score: Any) -> str:
+    """Format a single trending score (scores are 0-based)."""
+    if score is None:
+        return "N/A"
+    try:
+        return f"{int(score) + 1}"
+    except (ValueError, TypeError):
+        return str(score)
+
+def _format_btc_prices(prices: List[Any]) -> List[str]:
+    """Format a column of BTC prices, vectorizing the conversion for long lists."""
+    if len(prices) <= _VECTORIZE_MIN_ROWS:
+        return [_format_btc_price(price) for price in prices]
+    
+    import numpy as np
+    
+    # Numeric values are formatted in bulk; anything else takes the scalar path
+    numeric = np.fromiter((isinstance(p, (int, float)) for p in prices), dtype=bool, count=len(prices))
+    values = np.fromiter((p if n else 0.0 for p, n in zip(prices, numeric)), dtype=np.float64, count=len(prices))
+    formatted = np.char.mod("₿ %.8f", values).tolist()
+    return [f if n else _format_btc_price(p) for p, n, f in zip(prices, numeric, formatted)]
+
+def _format_scores(scores: List[Any]) -> List[str]:
+    """Format a column of trending scores, vectorizing the conversion for long lists."""
+    if len(scores) <= _VECTORIZE_MIN_ROWS:
+        return [_format_score(score) for score in scores]
+    
+    import numpy as np
+    
+    # Integer scores are shifted in bulk; anything else takes the scalar path
+    numeric = np.fromiter((isinstance(s, int) and _INT64_MIN <= s < _INT64_MAX for s in scores),
+                          dtype=bool, count=len(scores))
+    values = np.fromiter((s if n else 0 for s, n in zip(scores, numeric)), dtype=np.int64, count=len(scores))
+    formatted = (values + 1).astype(str).tolist()
+    return [f if n else _format_score(s) for s, n, f in zip(scores, numeric, formatted)]
+
+@functools.lru_cache(maxsize=32)
+def _format_update_time(timestamp: int) -> str:
+    """Format an update timestamp, caching results since it rarely changes."""
+    from datetime import datetime
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
 def display_update_time(data: Dict[str, Any]):
     """Display the last update time if available."""
     if 'updated_at' in data:
         try:
-            timestamp = data['updated_at']
-            dt = datetime.fromtimestamp(timestamp)
-            time_str = dt.strftime("%Y-%m-%d %H:%M:%S")
+            time_str = _format_update_time(int(data['updated_at']))
             console.print(f"\n[dim]Last updated: {time_str}[/dim]")
         except (TypeError, ValueError):
             pass
 
-def save_trending_data(data: Dict[str, Any], data_type: TrendingType = "all", filename: Optional[str] = None) -> str:
+def save_trending_data(data: Dict[str, Any], data_type: TrendingType = "all", filename: Optional[str] = None,
+                       pretty: bool = False) -> str:
     """
     Save trending data to a JSON file.
     
@@ -454,11 +371,13 @@ def save_trending_data(data: Dict[str, Any], data_type: TrendingType = "all", fi
         data (dict): Trending data
         data_type (str): Type of trending data ("coins", "nfts", or "all")
         filename (str, optional): Filename to save data to
+        pretty (bool): Whether to indent the JSON output (compact by default)
         
     Returns:
         str: Path to the saved file
     """
     if not filename:
+        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
         filename = f"trending_{data_type}_{timestamp}.json"
     
@@ -467,7 +386,7 @@ def save_trending_data(data: Dict[str, Any], data_type: TrendingType = "all", fi
         filename += '.json'
     
     # Write data to file
-    with open(filename, 'w') as f:
-        json.dump(data, f, indent=4)
+    with open(filename, 'wb') as f:
+        f.write(dumps_json(data, pretty))
     
-    return os.path.abspath(filename)
\ No newline at end of file
+    return os.path.abspath(filename)
@@ -0,0 +1,34 @@
+"""
+On-disk JSON cache helpers shared by the price and currency caches.
+"""
+from typing import Any, Dict
+import json
+import os
+import tempfile
+
+
+def write_json_cache(path: str, payload: Dict[str, Any]) -> None:
+    """
+    Write a cache entry atomically, ignoring filesystem errors.
+
+    Args:
+        path: Cache file to create or replace
+        payload: JSON-serializable cache entry
+    """
+    cache_dir = os.path.dirname(path)
+    tmp_name = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so readers never see a partial cache
+        with tempfile.NamedTemporaryFile('w', dir=cache_dir, suffix='.tmp', delete=False) as f:
+            tmp_name = f.name
+            json.dump(payload, f)
+        os.replace(tmp_name, path)
+    except OSError:
+        # Caching is best-effort; a failed write just means a fresh fetch next time
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
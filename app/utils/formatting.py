@@ -2,15 +2,32 @@
 Formatting utilities for the CLI interface.
 """
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+from rich.segment import Segment, Segments
 from rich.text import Text
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Iterable, Optional, Sequence, Tuple, TYPE_CHECKING
 import datetime
+import functools
+
+if TYPE_CHECKING:
+    from rich.panel import Panel
+    from rich.table import Table
 
 console = Console()
 
+# Pre-built row index labels so table loops don't call str() per row
+_INDEX_STRS = tuple(str(i) for i in range(1, 2001))
+
+
+def row_indices(count: int) -> Tuple[str, ...]:
+    """Return the 1-based row index labels for a table with the given row count."""
+    if count <= len(_INDEX_STRS):
+        return _INDEX_STRS[:count]
+    return _INDEX_STRS + tuple(str(i) for i in range(len(_INDEX_STRS) + 1, count + 1))
 
+
+# The returned Text is shared between callers through the cache; append it
+# or add it to a table, but do not stylize it in place.
+@functools.lru_cache(maxsize=2048)
 def format_price_change(change: float) -> Text:
     """Format price change with color based on positive or negative value."""
     text = f"{change:.2f}%"
@@ -35,6 +52,7 @@ def format_currency(amount: float, currency: str = "USD") -> str:
         return f"{amount:,.2f} {currency.upper()}"
 
 
+@functools.lru_cache(maxsize=2048)
 def format_large_number(number: float) -> str:
     """Format large numbers with K, M, B, T suffixes."""
     if number is None:
@@ -51,6 +69,7 @@ def format_large_number(number: float) -> str:
     return f"{number:.2f}"
 
 
+@functools.lru_cache(maxsize=32)
 def format_timestamp(timestamp: int) -> str:
     """Format unix timestamp to human-readable date."""
     if timestamp is None:
@@ -58,8 +77,10 @@ def format_timestamp(timestamp: int) -> str:
     return datetime.datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
 
 
-def create_coin_list_table(coins: List[Dict[str, Any]], currency: str = "usd") -> Table:
+def create_coin_list_table(coins: List[Dict[str, Any]], currency: str = "usd") -> "Table":
     """Create a rich table for displaying a list of coins."""
+    from rich.table import Table
+
     table = Table(title=f"Top Cryptocurrencies (in {currency.upper()})")
 
     table.add_column("#", justify="right")
@@ -70,9 +91,9 @@ def create_coin_list_table(coins: List[Dict[str, Any]], currency: str = "usd") -
     table.add_column("Market Cap", justify="right")
     table.add_column("Volume (24h)", justify="right")
 
-    for i, coin in enumerate(coins, 1):
+    for index, coin in zip(row_indices(len(coins)), coins):
         table.add_row(
-            str(i),
+            index,
             f"{coin['name']} ({coin['symbol'].upper()})",
             format_currency(coin['current_price'], currency),
             format_price_change(coin.get('price_change_percentage_24h', 0)),
@@ -85,8 +106,10 @@ def create_coin_list_table(coins: List[Dict[str, Any]], currency: str = "usd") -
     return table
 
 
-def create_coin_detail_panel(coin: Dict[str, Any], currency: str = "usd") -> Panel:
+def create_coin_detail_panel(coin: Dict[str, Any], currency: str = "usd") -> "Panel":
     """Create a rich panel for displaying detailed coin information."""
+    from rich.panel import Panel
+
     currency = currency.lower()
 
     content = Text()
@@ -139,6 +162,25 @@ def create_coin_detail_panel(coin: Dict[str, Any], currency: str = "usd") -> Pan
     )
 
 
+def print_plain_table(title: str, headers: Sequence[str], rows: Iterable[Sequence[Any]],
+                      target: Optional[Console] = None) -> None:
+    """
+    Print a table as tab-separated plain text, for when stdout is not a terminal.
+    
+    Args:
+        title: Title line printed above the header
+        headers: Column headers
+        rows: Iterable of row cells (strings or rich Text objects)
+        target: Console to print through (defaults to the shared console)
+    """
+    lines = [title, "\t".join(headers)]
+    lines.extend("\t".join(map(str, row)) for row in rows)
+    lines.append("")
+    # Hand the text over as one raw segment: rich would expand the tabs in a
+    # string, but segments still go through the console's buffer and capture
+    (target or console).print(Segments([Segment("\n".join(lines))]), crop=False)
+
+
 def print_error(message: str):
     """Print an error message."""
     console.print(f"[bold red]Error:[/bold red] {message}")
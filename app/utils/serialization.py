@@ -0,0 +1,25 @@
+"""
+JSON serialization helpers shared by the save commands.
+"""
+from typing import Any
+import functools
+
+
+@functools.lru_cache(maxsize=1)
+def _json_encoder():
+    """Import the fastest available JSON encoder on first use: orjson, then ujson, then json."""
+    try:
+        import orjson
+        return lambda obj, pretty: orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    except ImportError:
+        pass
+    try:
+        import ujson as json_impl
+    except ImportError:
+        import json as json_impl
+    return lambda obj, pretty: (json_impl.dumps(obj, indent=2) if pretty else json_impl.dumps(obj)).encode('utf-8')
+
+
+def dumps_json(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize data to UTF-8 JSON bytes with the selected encoder."""
+    return _json_encoder()(obj, pretty)
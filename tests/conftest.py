@@ -2,14 +2,16 @@
 Test fixtures and utility functions for testing the CryptoCLI application.
 """
 import pytest
-from unittest.mock import MagicMock, patch
-import os
-import io
-import sys
+from unittest.mock import Mock, patch
+
+from app.api import CoinGeckoAPI
+
+# Pure-data response fixtures are built once per session and shared between
+# tests, so tests must not mutate the returned dicts and lists.
 
 # ========== PRICE API FIXTURES ==========
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_simple_price_response():
     """Mock response for the simple/price endpoint"""
     return {
@@ -19,7 +21,7 @@ def mock_simple_price_response():
         }
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_detailed_price_response():
     """Mock response for the markets endpoint with more detailed price/market data"""
     return [
@@ -44,7 +46,7 @@ def mock_detailed_price_response():
         }
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_empty_response():
     """Empty response for testing edge cases"""
     return {}
@@ -65,36 +67,24 @@ def mock_error_response():
 @pytest.fixture
 def mock_api():
     """Mock the entire CoinGeckoAPI class"""
-    mock = MagicMock()
+    mock = Mock(spec=CoinGeckoAPI)
     mock.get_price.return_value = {}  # Default empty response
     return mock
 
-@pytest.fixture
-def capture_stdout():
-    """Capture stdout for testing console output"""
-    captured_output = io.StringIO()
-    sys.stdout = captured_output
-    yield captured_output
-    sys.stdout = sys.__stdout__
+@pytest.fixture(scope="session")
+def cli_runner():
+    """Click test runner shared by the CLI command tests"""
+    from click.testing import CliRunner
+    return CliRunner()
 
-@pytest.fixture
-def setup_environment():
+@pytest.fixture(autouse=True)
+def setup_environment(monkeypatch):
     """Set up environment variables required for testing"""
-    # Store original environment variables
-    old_env = dict(os.environ)
-    
-    # Set required environment variables for testing
-    os.environ["COINGECKO_BASE_URL"] = "https://api.coingecko.com/api/v3"
-    os.environ["COINGECKO_API_KEY"] = "test_api_key"
-    
-    # Return control to the test
-    yield
-    
-    # Restore original environment
-    os.environ.clear()
-    os.environ.update(old_env)
+    # monkeypatch restores only these keys on teardown
+    monkeypatch.setenv("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3")
+    monkeypatch.setenv("COINGECKO_API_KEY", "test_api_key")
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_multiple_crypto_price_response():
     """Mock response for multiple cryptocurrencies from the simple/price endpoint"""
     return {
@@ -115,7 +105,7 @@ def mock_multiple_crypto_price_response():
         }
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_multiple_markets_response():
     """Mock response for multiple cryptocurrencies from the markets endpoint"""
     return [
@@ -148,7 +138,7 @@ def mock_multiple_markets_response():
         }
     ]
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_trending_coins_response():
     """Mock response for the search/trending endpoint with coins data"""
     return {
@@ -188,7 +178,7 @@ def mock_trending_coins_response():
         "updated_at": 1627851600  # Timestamp example: August 1, 2021
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_trending_nfts_response():
     """Mock response for the search/trending endpoint with NFTs data"""
     return {
@@ -237,7 +227,7 @@ def mock_trending_nfts_response():
         "updated_at": 1627851600  # Timestamp example: August 1, 2021
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_trending_combined_response():
     """Mock response for the search/trending endpoint with both coins and NFTs data"""
     return {
@@ -290,7 +280,7 @@ def mock_trending_combined_response():
         "updated_at": 1627851600  # Timestamp example: August 1, 2021
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_bitcoin_treasury_response():
     """Mock response for the companies/public_treasury/bitcoin endpoint"""
     return {
@@ -334,7 +324,7 @@ def mock_bitcoin_treasury_response():
         ]
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ethereum_treasury_response():
     """Mock response for the companies/public_treasury/ethereum endpoint"""
     return {
@@ -367,7 +357,7 @@ def mock_ethereum_treasury_response():
         ]
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_empty_treasury_response():
     """Mock empty response for the companies/public_treasury endpoint"""
     return {
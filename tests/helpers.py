@@ -0,0 +1,7 @@
+"""
+Helpers shared by the CryptoCLI test modules.
+"""
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is an optional extra; fall back to the stdlib parser
+    from json import loads as json_loads
@@ -2,6 +2,7 @@
 """
 Test runner script for CryptoCLI
 """
+import importlib.util
 import pytest
 import sys
 import os
@@ -15,10 +16,25 @@ if __name__ == "__main__":
     pytest_args = [
         "tests",                   # directory containing tests
         "-v",                      # verbose output
-        "--cov=CryptoCLI",         # measure coverage for CryptoCLI package
-        "--cov-report=term",       # report coverage in terminal
-        "--cov-report=html:coverage_html",  # generate HTML report
     ]
     
+    # Spread tests across all CPU cores when pytest-xdist is installed. Each
+    # test file stays on one worker, so its session-scoped data fixtures are
+    # built once rather than once per worker that picks up one of its tests
+    if importlib.util.find_spec("xdist") is not None:
+        pytest_args += ["-n", "auto", "--dist", "loadfile"]
+    
+    # Coverage tracing slows every test down, so only enable it on request
+    if os.environ.get("COVERAGE") == "1":
+        # On Python 3.12+ coverage.py (7.4+) can trace with sys.monitoring, which
+        # costs far less per line than the default sys.settrace tracer
+        if sys.version_info >= (3, 12):
+            os.environ.setdefault("COVERAGE_CORE", "sysmon")
+        pytest_args += [
+            "--cov=CryptoCLI",         # measure coverage for CryptoCLI package
+            "--cov-report=term",       # report coverage in terminal
+            "--cov-report=html:coverage_html",  # generate HTML report
+        ]
+    
     result = pytest.main(pytest_args)
     sys.exit(result)
\ No newline at end of file
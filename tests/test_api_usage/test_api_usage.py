@@ -2,31 +2,36 @@
 Test for API usage statistics functionality.
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, Mock
+from rich.console import Console
 from app.api_usage import get_api_usage, display_usage_stats
-import json
-import os
 from io import StringIO
+from pathlib import Path
 from datetime import datetime, timedelta
 
-@pytest.fixture
+from tests.helpers import json_loads
+
+# Dates for the mock usage data, fixed so the usage-rate recommendation is stable
+_NOW = datetime(2024, 5, 20, 12, 0)
+_TODAY = _NOW.strftime("%Y-%m-%d")
+_CURRENT_MONTH = _NOW.strftime("%Y-%m")
+_YESTERDAY = (_NOW - timedelta(days=1)).strftime("%Y-%m-%d")
+_LAST_MONTH = (_NOW - timedelta(days=30)).strftime("%Y-%m")
+_RESET_TS = int((_NOW + timedelta(hours=1)).timestamp())
+
+@pytest.fixture(scope="session")
 def mock_api_usage_data():
     """Fixture with mock API usage data"""
-    today = datetime.now().strftime("%Y-%m-%d")
-    current_month = datetime.now().strftime("%Y-%m")
-    yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-    last_month = (datetime.now() - timedelta(days=30)).strftime("%Y-%m")
-    
     return {
         "total_calls": 1250,
         "calls_today": 45,
-        "first_call_date": yesterday,
-        "last_call_date": today,
+        "first_call_date": _YESTERDAY,
+        "last_call_date": _TODAY,
         "rate_limit_info": {
             "api_key": "demo_key",
             "limit": 10000,
             "remaining": 8750,
-            "reset": int((datetime.now() + timedelta(hours=1)).timestamp()),
+            "reset": _RESET_TS,
             "credits_monthly_limit": 10000,
             "credits_used_month": 1250,
             "credits_remaining_month": 8750,
@@ -34,12 +39,12 @@ def mock_api_usage_data():
             "credits_remaining_second": 10
         },
         "daily_calls": {
-            yesterday: 75,
-            today: 45
+            _YESTERDAY: 75,
+            _TODAY: 45
         },
         "monthly_usage": {
-            last_month: 980,
-            current_month: 1250
+            _LAST_MONTH: 980,
+            _CURRENT_MONTH: 1250
         },
         "endpoints_called": {
             "simple/price": 450,
@@ -58,7 +63,7 @@ def mock_api_usage_data():
         }
     }
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_empty_usage_data():
     """Fixture with empty API usage data"""
     return {
@@ -71,10 +76,30 @@ def mock_empty_usage_data():
         "endpoints_called": {}
     }
 
+@pytest.fixture
+def usage_console(monkeypatch):
+    """Console that renders display_usage_stats output as plain text into a buffer"""
+    console = Console(file=StringIO(), width=120)
+    monkeypatch.setattr("app.api_usage.console", console)
+    # print_success and print_warning write through the shared formatting console
+    monkeypatch.setattr("app.utils.formatting.console", console)
+    return console
+
+class _FrozenDatetime(datetime):
+    """datetime whose now() returns the module's fixed _NOW"""
+    @classmethod
+    def now(cls, tz=None):
+        return _NOW
+
+@pytest.fixture
+def frozen_usage_clock(monkeypatch):
+    """Pin the clock display_usage_stats reads for the current month and day"""
+    monkeypatch.setattr("app.api_usage.datetime", _FrozenDatetime)
+
 def test_get_api_usage_without_refresh(monkeypatch):
     """Test getting API usage stats without forcing a refresh"""
     # Create a mock API instance
-    mock_api = MagicMock()
+    mock_api = Mock(spec=["get_usage_stats", "get_supported_vs_currencies"])
     mock_api.get_usage_stats.return_value = {"total_calls": 100}
     
     # Patch the API instance
@@ -93,7 +118,7 @@ def test_get_api_usage_without_refresh(monkeypatch):
 def test_get_api_usage_with_refresh(monkeypatch):
     """Test getting API usage stats with forcing a refresh"""
     # Create a mock API instance
-    mock_api = MagicMock()
+    mock_api = Mock(spec=["get_usage_stats", "get_supported_vs_currencies"])
     mock_api.get_usage_stats.return_value = {"total_calls": 100}
     
     # Patch the API instance
@@ -109,70 +134,53 @@ def test_get_api_usage_with_refresh(monkeypatch):
     assert result == {"total_calls": 100}
     assert mock_api.get_usage_stats.call_count == 1
 
-def test_display_usage_stats(mock_api_usage_data, monkeypatch, capsys):
-    """Test displaying API usage statistics"""
-    # Create a StringIO object to capture rich console output
-    console_output = StringIO()
-    
-    # Create a mock console
-    mock_console = MagicMock()
-    mock_console.print = lambda *args, **kwargs: console_output.write(str(args[0]) + '\n')
-    
-    # Patch the console
-    monkeypatch.setattr("app.api_usage.console", mock_console)
-    
-    # Call the function
-    display_usage_stats(mock_api_usage_data)
-    
-    # Get the output
-    output = console_output.getvalue()
-    
-    # Check that the main sections are in the output
-    assert "CoinGecko API Usage Statistics" in output
-    assert "Basic Usage Information" in output
-    assert "Rate Limit Information" in output
-    assert "Monthly Usage" in output
-    assert "Endpoint Usage" in output
-    assert "Recommendations" in output
-    
-    # Check that key information is displayed
-    assert "Total calls: 1.25K" in output
-    assert "Calls today: 45" in output
-    assert "API Key: demo_key" in output
-    assert "Monthly credit limit: 10K" in output
-    assert "Credits remaining this month: 8.75K" in output
-
-def test_display_usage_stats_empty(mock_empty_usage_data, monkeypatch, capsys):
-    """Test displaying empty API usage statistics"""
-    # Create a StringIO object to capture rich console output
-    console_output = StringIO()
-    
-    # Create a mock console
-    mock_console = MagicMock()
-    mock_console.print = lambda *args, **kwargs: console_output.write(str(args[0]) + '\n')
-    
-    # Patch the console
-    monkeypatch.setattr("app.api_usage.console", mock_console)
-    
+@pytest.mark.parametrize("data_fixture,expected_present,expected_absent", [
+    ("mock_api_usage_data", [
+        "Rate Limit Information",
+        "Monthly Usage",
+        "Endpoint Usage",
+        "Recommendations",
+        "Total calls: 1.25K",
+        "Calls today: 45.00",
+        "API Key: demo_key",
+        "Monthly credit limit: 10.00K",
+        "Credits remaining this month: 8.75K",
+        "Remaining requests: 8750",
+        "Success: Current usage rate (62 calls/day) is within your monthly limit.",
+    ], [
+        "Warning:",
+    ]),
+    ("mock_empty_usage_data", [
+        "Total calls: 0",
+        "Calls today: 0",
+        "First API call: Never",
+        "Last API call: Never",
+    ], [
+        # Rate limit info section shouldn't have detailed content
+        "Monthly credit limit",
+        "Credits used this month",
+        "Recommendations",
+    ]),
+], ids=["full", "empty"])
+def test_display_usage_stats(request, usage_console, frozen_usage_clock, data_fixture, expected_present, expected_absent):
+    """Test displaying full and empty API usage statistics"""
     # Call the function
-    display_usage_stats(mock_empty_usage_data)
+    display_usage_stats(request.getfixturevalue(data_fixture))
     
     # Get the output
-    output = console_output.getvalue()
+    output = usage_console.file.getvalue()
     
     # Check that the main sections are in the output
     assert "CoinGecko API Usage Statistics" in output
     assert "Basic Usage Information" in output
+    # Styled values are rendered, not printed as literal markup tags
+    assert "[/" not in output
     
     # Check that key information is displayed
-    assert "Total calls: 0" in output
-    assert "Calls today: 0" in output
-    assert "First API call: Never" in output
-    assert "Last API call: Never" in output
-    
-    # Rate limit info section shouldn't have detailed content
-    assert "Monthly credit limit" not in output
-    assert "Credits used this month" not in output
+    for text in expected_present:
+        assert text in output
+    for text in expected_absent:
+        assert text not in output
 
 def test_save_api_usage_export(mock_api_usage_data, tmp_path):
     """Test saving API usage data to a file"""
@@ -182,14 +190,13 @@ def test_save_api_usage_export(mock_api_usage_data, tmp_path):
     output_file = tmp_path / "test_usage_export.json"
     
     # Save the data
-    result_path = save_api_usage_export(mock_api_usage_data, str(output_file))
+    result_path = Path(save_api_usage_export(mock_api_usage_data, str(output_file)))
     
     # Assert the file exists
-    assert os.path.exists(result_path)
+    assert result_path.exists()
     
     # Read the file and verify content
-    with open(result_path, 'r') as f:
-        saved_data = json.load(f)
+    saved_data = json_loads(result_path.read_bytes())
     
     # Verify the saved data matches the input
     assert saved_data == mock_api_usage_data
@@ -2,19 +2,19 @@
 Tests for the currencies functionality.
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, DEFAULT
 import json
 import os
-from io import StringIO
-import sys
 
 # Import modules to test
 from app.currencies import get_supported_currencies, display_supported_currencies, save_currencies_data
+from app.main import currencies as currencies_cmd
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_currencies_response():
     """Mock response for the CoinGecko supported_vs_currencies endpoint"""
-    return [
+    # Shared by the whole module, so it is immutable; mocks of the API return list(...) copies
+    return (
         "usd", "aed", "ars", "aud", "bch", "bdt", "bhd", "bmd", "bnb", "brl",
         "btc", "cad", "chf", "clp", "cny", "czk", "dkk", "dot", "eos", "eth",
         "eur", "gbp", "hkd", "huf", "idr", "ils", "inr", "jpy", "krw", "kwd",
@@ -22,37 +22,48 @@ def mock_currencies_response():
         "pln", "rub", "sar", "sek", "sgd", "thb", "try", "twd", "uah", "vef",
         "vnd", "xag", "xau", "xdr", "xlm", "xrp", "yfi", "zar", "bits", "link",
         "sats"
-    ]
+    )
+
+
+@pytest.fixture
+def mock_api(mock_api):
+    """The conftest API mock, patched in as app.currencies.api for the test"""
+    with patch('app.currencies.api', mock_api):
+        yield mock_api
 
 
 class TestCurrenciesRetrieval:
     """Test cases for fetching supported currencies."""
 
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, tmp_path, monkeypatch):
+        """Keep the supported currencies cache inside the test's temp directory"""
+        monkeypatch.setattr('app.currencies.CACHE_PATH', str(tmp_path / "vs_currencies.json"))
+
     def test_get_currencies_basic(self, mock_api, mock_currencies_response):
         """
         Test fetching the list of supported currencies.
         Should return data in the expected format.
         """
         # Setup the mock API to return our test data
-        mock_api.get_supported_vs_currencies.return_value = mock_currencies_response
+        mock_api.get_supported_vs_currencies.return_value = list(mock_currencies_response)
         
         # Call the function with display off to check return value only
-        with patch('currencies.api', mock_api):
-            with patch('currencies.display_supported_currencies') as mock_display:
-                result = get_supported_currencies(display=False, save=False)
-                
-                # Check the API was called
-                mock_api.get_supported_vs_currencies.assert_called_once()
-                
-                # Verify display function wasn't called
-                mock_display.assert_not_called()
-                
-                # Verify the result matches our mock data
-                assert result == mock_currencies_response
-                assert len(result) == len(mock_currencies_response)
-                assert "usd" in result
-                assert "eur" in result
-                assert "btc" in result
+        with patch.multiple('app.currencies', display_supported_currencies=DEFAULT) as mocks:
+            result = get_supported_currencies(display=False, save=False)
+            
+            # Check the API was called
+            mock_api.get_supported_vs_currencies.assert_called_once()
+            
+            # Verify display function wasn't called
+            mocks['display_supported_currencies'].assert_not_called()
+            
+            # Verify the result matches our mock data
+            assert result == list(mock_currencies_response)
+            assert len(result) == len(mock_currencies_response)
+            assert "usd" in result
+            assert "eur" in result
+            assert "btc" in result
 
     def test_get_currencies_with_display(self, mock_api, mock_currencies_response):
         """
@@ -60,18 +71,17 @@ class TestCurrenciesRetrieval:
         Should call the display function.
         """
         # Setup the mock API to return our test data
-        mock_api.get_supported_vs_currencies.return_value = mock_currencies_response
+        mock_api.get_supported_vs_currencies.return_value = list(mock_currencies_response)
         
         # Call the function with display on
-        with patch('currencies.api', mock_api):
-            with patch('currencies.display_supported_currencies') as mock_display:
-                result = get_supported_currencies(display=True, save=False)
-                
-                # Verify display function was called with the right data
-                mock_display.assert_called_once_with(mock_currencies_response)
-                
-                # Verify the result matches our mock data
-                assert result == mock_currencies_response
+        with patch.multiple('app.currencies', display_supported_currencies=DEFAULT) as mocks:
+            result = get_supported_currencies(display=True, save=False)
+            
+            # Verify display function was called with the right data
+            mocks['display_supported_currencies'].assert_called_once_with(list(mock_currencies_response))
+            
+            # Verify the result matches our mock data
+            assert result == list(mock_currencies_response)
 
     def test_get_currencies_with_save(self, mock_api, mock_currencies_response, tmp_path):
         """
@@ -79,22 +89,21 @@ class TestCurrenciesRetrieval:
         Should call the save function with the right parameters.
         """
         # Setup the mock API to return our test data
-        mock_api.get_supported_vs_currencies.return_value = mock_currencies_response
+        mock_api.get_supported_vs_currencies.return_value = list(mock_currencies_response)
         
         # Create a temporary file path
         test_output = tmp_path / "test_currencies.json"
         
         # Call the function with save on
-        with patch('currencies.api', mock_api):
-            with patch('currencies.display_supported_currencies') as mock_display:
-                with patch('currencies.save_currencies_data') as mock_save:
-                    result = get_supported_currencies(display=True, save=True, output=str(test_output))
-                    
-                    # Verify save function was called with the right data
-                    mock_save.assert_called_once_with(mock_currencies_response, str(test_output))
-                    
-                    # Verify the result matches our mock data
-                    assert result == mock_currencies_response
+        with patch.multiple('app.currencies', display_supported_currencies=DEFAULT,
+                            save_currencies_data=DEFAULT) as mocks:
+            result = get_supported_currencies(display=True, save=True, output=str(test_output))
+            
+            # Verify save function was called with the right data
+            mocks['save_currencies_data'].assert_called_once_with(list(mock_currencies_response), str(test_output))
+            
+            # Verify the result matches our mock data
+            assert result == list(mock_currencies_response)
 
     def test_get_currencies_empty_response(self, mock_api):
         """
@@ -105,15 +114,14 @@ class TestCurrenciesRetrieval:
         mock_api.get_supported_vs_currencies.return_value = []
         
         # Call the function
-        with patch('currencies.api', mock_api):
-            with patch('currencies.print_error') as mock_error:
-                result = get_supported_currencies(display=True, save=False)
-                
-                # Verify error was displayed
-                mock_error.assert_called_once_with("No supported currencies found.")
-                
-                # Verify the function returns None
-                assert result is None
+        with patch.multiple('app.currencies', print_error=DEFAULT) as mocks:
+            result = get_supported_currencies(display=True, save=False)
+            
+            # Verify error was displayed
+            mocks['print_error'].assert_called_once_with("No supported currencies found.")
+            
+            # Verify the function returns None
+            assert result is None
 
     def test_get_currencies_api_error(self, mock_api):
         """
@@ -124,15 +132,14 @@ class TestCurrenciesRetrieval:
         mock_api.get_supported_vs_currencies.side_effect = Exception("API Error")
         
         # Call the function
-        with patch('currencies.api', mock_api):
-            with patch('currencies.print_error') as mock_error:
-                result = get_supported_currencies(display=True, save=False)
-                
-                # Verify error was displayed
-                mock_error.assert_called_once_with("Failed to retrieve supported currencies: API Error")
-                
-                # Verify the function returns None
-                assert result is None
+        with patch.multiple('app.currencies', print_error=DEFAULT) as mocks:
+            result = get_supported_currencies(display=True, save=False)
+            
+            # Verify error was displayed
+            mocks['print_error'].assert_called_once_with("Failed to retrieve supported currencies: API Error")
+            
+            # Verify the function returns None
+            assert result is None
 
 
 class TestCurrencyDisplay:
@@ -143,11 +150,8 @@ class TestCurrencyDisplay:
         Test that the display function formats currencies correctly.
         Should output a table with currency codes and categories.
         """
-        # Create a StringIO object to capture stdout
-        captured_output = StringIO()
-        
         # Patch the console
-        with patch('currencies.console') as mock_console:
+        with patch('app.currencies.console') as mock_console:
             # Call the function
             display_supported_currencies(mock_currencies_response)
             
@@ -177,7 +181,7 @@ class TestCurrencySaving:
         monkeypatch.chdir(tmp_path)
         
         # Patch the console
-        with patch('currencies.console') as mock_console:
+        with patch('app.currencies.console') as mock_console:
             # Call the function
             save_currencies_data(mock_currencies_response)
             
@@ -186,15 +190,14 @@ class TestCurrencySaving:
             assert default_file.exists()
             
             # Verify content of the saved file
-            with open(default_file, 'r') as f:
-                saved_data = json.load(f)
-                
-                # Check structure of saved data
-                assert "supported_currencies" in saved_data
-                assert "count" in saved_data
-                assert saved_data["count"] == len(mock_currencies_response)
-                assert len(saved_data["supported_currencies"]) == len(mock_currencies_response)
-                assert "usd" in saved_data["supported_currencies"]
+            saved_data = json.loads(default_file.read_text())
+            
+            # Check structure of saved data
+            assert "supported_currencies" in saved_data
+            assert "count" in saved_data
+            assert saved_data["count"] == len(mock_currencies_response)
+            assert len(saved_data["supported_currencies"]) == len(mock_currencies_response)
+            assert "usd" in saved_data["supported_currencies"]
             
             # Verify success message was shown
             mock_console.print.assert_called_once()
@@ -209,7 +212,7 @@ class TestCurrencySaving:
         custom_file = tmp_path / "custom_currencies.json"
         
         # Patch the console
-        with patch('currencies.console') as mock_console:
+        with patch('app.currencies.console') as mock_console:
             # Call the function
             save_currencies_data(mock_currencies_response, str(custom_file))
             
@@ -217,10 +220,9 @@ class TestCurrencySaving:
             assert custom_file.exists()
             
             # Verify content of the saved file
-            with open(custom_file, 'r') as f:
-                saved_data = json.load(f)
-                assert "supported_currencies" in saved_data
-                assert len(saved_data["supported_currencies"]) == len(mock_currencies_response)
+            saved_data = json.loads(custom_file.read_text())
+            assert "supported_currencies" in saved_data
+            assert len(saved_data["supported_currencies"]) == len(mock_currencies_response)
             
             # Verify success message was shown with custom filename
             mock_console.print.assert_called_once()
@@ -235,7 +237,7 @@ class TestCurrencySaving:
         invalid_file = "/nonexistent/directory/currencies.json"
         
         # Patch the error display
-        with patch('currencies.print_error') as mock_error:
+        with patch('app.currencies.print_error') as mock_error:
             # Call the function
             save_currencies_data(mock_currencies_response, invalid_file)
             
@@ -244,101 +246,67 @@ class TestCurrencySaving:
             assert "Failed to save currency data" in str(mock_error.call_args)
 
 
-class TestCLICommand:
-    """Test cases for the currencies CLI command."""
+class TestCurrencyCache:
+    """Test cases for the on-disk supported currencies cache."""
 
-    def test_currencies_command_basic(self, mock_api, mock_currencies_response, monkeypatch):
+    def test_cache_hit_skips_api(self, mock_api, mock_currencies_response, tmp_path, monkeypatch):
         """
-        Test the currencies command without options.
-        Should call get_supported_currencies with the right parameters.
+        Test that a fresh cache is used instead of calling the API.
+        Should return the cached list without an API request.
         """
-        # Import the CLI runner from Click
-        from click.testing import CliRunner
-        
-        # Create a runner
-        runner = CliRunner()
-        
-        # Import the CLI function
-        from app.main import currencies
+        monkeypatch.setattr('app.currencies.CACHE_PATH', str(tmp_path / "vs_currencies.json"))
+        mock_api.get_supported_vs_currencies.return_value = list(mock_currencies_response)
         
-        # Setup the mock API
-        mock_api.get_supported_vs_currencies.return_value = mock_currencies_response
+        first = get_supported_currencies(display=False)
+        second = get_supported_currencies(display=False)
         
-        # Patch the get_supported_currencies function
-        with patch('main.get_supported_currencies') as mock_function:
-            # Run the command
-            result = runner.invoke(currencies)
-            
-            # Verify the function was called with the right parameters
-            mock_function.assert_called_once_with(
-                display=True,
-                save=False,
-                output=None
-            )
-            
-            # Verify exit code
-            assert result.exit_code == 0
+        # Only the first call should reach the API
+        mock_api.get_supported_vs_currencies.assert_called_once()
+        assert first == list(mock_currencies_response)
+        assert second == list(mock_currencies_response)
 
-    def test_currencies_command_with_save(self, mock_api, mock_currencies_response, monkeypatch):
+    def test_stale_cache_and_refresh_call_api(self, mock_api, mock_currencies_response, tmp_path, monkeypatch):
         """
-        Test the currencies command with --save option.
-        Should call get_supported_currencies with save=True.
+        Test that a stale cache or an explicit refresh goes back to the API.
+        Should call the API on every request.
         """
-        # Import the CLI runner from Click
-        from click.testing import CliRunner
+        cache_file = tmp_path / "vs_currencies.json"
+        monkeypatch.setattr('app.currencies.CACHE_PATH', str(cache_file))
+        mock_api.get_supported_vs_currencies.return_value = list(mock_currencies_response)
         
-        # Create a runner
-        runner = CliRunner()
+        get_supported_currencies(display=False)
         
-        # Import the CLI function
-        from app.main import currencies
+        # Age the cache file past the TTL
+        old = cache_file.stat().st_mtime - 2 * 24 * 60 * 60
+        os.utime(cache_file, (old, old))
+        get_supported_currencies(display=False)
         
-        # Setup the mock API
-        mock_api.get_supported_vs_currencies.return_value = mock_currencies_response
+        get_supported_currencies(display=False, refresh=True)
         
-        # Patch the get_supported_currencies function
-        with patch('main.get_supported_currencies') as mock_function:
-            # Run the command with --save
-            result = runner.invoke(currencies, ['--save'])
-            
-            # Verify the function was called with save=True
-            mock_function.assert_called_once_with(
-                display=True,
-                save=True,
-                output=None
-            )
-            
-            # Verify exit code
-            assert result.exit_code == 0
+        assert mock_api.get_supported_vs_currencies.call_count == 3
 
-    def test_currencies_command_with_custom_output(self, mock_api, mock_currencies_response, monkeypatch):
+
+class TestCLICommand:
+    """Test cases for the currencies CLI command."""
+
+    @pytest.mark.parametrize("argv,expected", [
+        ([], dict(display=True, save=False, output=None, refresh=False)),
+        (['--save'], dict(display=True, save=True, output=None, refresh=False)),
+        (['--save', '--output', 'custom.json'], dict(display=True, save=True, output='custom.json', refresh=False)),
+        (['--refresh'], dict(display=True, save=False, output=None, refresh=True)),
+    ], ids=["basic", "save", "custom_output", "refresh"])
+    def test_currencies_command(self, cli_runner, argv, expected):
         """
-        Test the currencies command with --save and --output options.
-        Should call get_supported_currencies with the custom output path.
+        Test the currencies command with and without its options.
+        Should call get_supported_currencies with the matching parameters.
         """
-        # Import the CLI runner from Click
-        from click.testing import CliRunner
-        
-        # Create a runner
-        runner = CliRunner()
-        
-        # Import the CLI function
-        from app.main import currencies
-        
-        # Setup the mock API
-        mock_api.get_supported_vs_currencies.return_value = mock_currencies_response
-        
         # Patch the get_supported_currencies function
-        with patch('main.get_supported_currencies') as mock_function:
-            # Run the command with --save and --output
-            result = runner.invoke(currencies, ['--save', '--output', 'custom.json'])
+        with patch('app.main.get_supported_currencies') as mock_function:
+            # Run the command
+            result = cli_runner.invoke(currencies_cmd, argv)
             
-            # Verify the function was called with save=True and the custom output
-            mock_function.assert_called_once_with(
-                display=True,
-                save=True,
-                output='custom.json'
-            )
+            # Verify the function was called with the right parameters
+            mock_function.assert_called_once_with(**expected)
             
             # Verify exit code
-            assert result.exit_code == 0
\ No newline at end of file
+            assert result.exit_code == 0
@@ -9,6 +9,7 @@ import sys
 from io import StringIO
 from datetime import datetime
 import tempfile
+import time
 
 # To run these tests, you will need:
 # - pytest
@@ -283,6 +284,43 @@ class TestOHLCDataDisplay:
         # Check for chart symbols in the output
         assert "●" in output or "│" in output or "─" in output or "/" in output or "\\" in output
 
+    @pytest.mark.parametrize("closes,width,height,expected_rows", [
+        ([10.0, 14.0, 11.0, 13.0, 10.5, 12.0, 14.0, 10.0], 15, 6, [
+            "$14.00      ●         ●  ",
+            "$13.20      /\\  ●    /\\  ",
+            "$12.40     / \\ / \\  ●  \\ ",
+            "$11.60     /  ●  \\ /   \\ ",
+            "$10.80    /       ●     \\",
+            "$10.00    ●             ●",
+        ]),
+        ([16.0, 17.0], 5, 3, [
+            "$17.00        ●",
+            "$16.50      // ",
+            "$16.00    ●/   ",
+        ]),
+        ([17.0, 16.0], 5, 3, [
+            "$17.00    ●\\   ",
+            "$16.50      \\\\ ",
+            "$16.00        ●",
+        ]),
+    ], ids=["zigzag", "rising_tie", "falling_tie"])
+    def test_display_ascii_chart_grid(self, monkeypatch, closes, width, height, expected_rows):
+        """
+        Test the rendered chart rows for small fixed series.
+        Should match the cell-by-cell Bresenham line drawing, including diagonal ties.
+        """
+        day_ms = 24 * 60 * 60 * 1000
+        data = [[1_700_000_000_000 + i * day_ms, c, c, c, c] for i, c in enumerate(closes)]
+        
+        captured_output = StringIO()
+        monkeypatch.setattr('sys.stdout', captured_output)
+        
+        display_ascii_chart(data, 'bitcoin', 'usd', width=width, height=height)
+        
+        # Rows between the header and the x-axis; the axis dates depend on the local timezone
+        rows = captured_output.getvalue().splitlines()[3:3 + height]
+        assert rows == expected_rows
+
 class TestOHLCDataSaving:
     """Test cases for saving OHLC data to file."""
     
@@ -336,6 +374,23 @@ class TestOHLCDataSaving:
             except:
                 pass
     
+    def test_save_ohlc_data_pretty(self, mock_ohlc_response, tmp_path, monkeypatch):
+        """
+        Test saving OHLC data with pretty set.
+        Should write the same document as the streamed default, indented by two spaces.
+        """
+        monkeypatch.setattr('time.time', lambda: 1617292800)
+        compact_file = tmp_path / "compact.json"
+        pretty_file = tmp_path / "pretty.json"
+        
+        save_ohlc_data(mock_ohlc_response, 'bitcoin', 'usd', 7, str(compact_file))
+        save_ohlc_data(mock_ohlc_response, 'bitcoin', 'usd', 7, str(pretty_file), pretty=True)
+        
+        pretty_text = pretty_file.read_text(encoding="utf-8")
+        assert json.loads(pretty_text) == json.loads(compact_file.read_text(encoding="utf-8"))
+        assert pretty_text.startswith('{\n  "coin_id": "bitcoin",\n')
+        assert '\n    {\n      "timestamp": ' in pretty_text
+    
     def test_save_ohlc_data_default_filename(self, mock_ohlc_response, monkeypatch):
         """
         Test saving OHLC data with a default generated filename.
@@ -355,9 +410,9 @@ class TestOHLCDataSaving:
         assert "ethereum_eur_ohlc_30d_1617292800.json" in result
         
         # Verify that the file was opened for writing
-        mock_file.assert_called_once_with(result, 'w')
+        mock_file.assert_called_once_with(result, 'wb')
         
-        # Verify that json.dump was called with the right data structure
+        # Verify that the encoded JSON was written to the file
         handle = mock_file()
         assert handle.write.called
     
@@ -475,9 +530,26 @@ class TestOHLCWithCLIIntegration:
             'ethereum',
             'eur',
             30,
-            'custom_output.json'
+            'custom_output.json',
+            pretty=False
         )
     
+    def test_ohlc_command_pretty(self, mock_api, mock_ohlc_response, monkeypatch):
+        """
+        Test the OHLC command with --pretty.
+        Should ask save_ohlc_data for indented output.
+        """
+        mock_save_ohlc = MagicMock(return_value="test_output.json")
+        monkeypatch.setattr('app.main.get_ohlc_data', MagicMock(return_value=mock_ohlc_response))
+        monkeypatch.setattr('app.main.save_ohlc_data', mock_save_ohlc)
+        
+        from app.main import ohlc
+        runner = CliRunner()
+        result = runner.invoke(ohlc, ['bitcoin', '--save', '--pretty'])
+        
+        assert result.exit_code == 0
+        mock_save_ohlc.assert_called_once_with(mock_ohlc_response, 'bitcoin', 'usd', 7, None, pretty=True)
+    
     def test_ohlc_command_no_data(self, mock_api, monkeypatch):
         """
         Test the OHLC command when no data is returned.
@@ -498,4 +570,37 @@ class TestOHLCWithCLIIntegration:
         # Should not try to save empty data
         # This is checking that the code in main.py correctly checks
         # if ohlc_data before trying to save it
-        assert "No OHLC data" in result.output or "warning" in result.output.lower()
\ No newline at end of file
+        assert "No OHLC data" in result.output or "warning" in result.output.lower()
+
+class TestOHLCResponseCache:
+    """Test cases for the in-process OHLC response cache."""
+    
+    def test_repeated_request_uses_cache(self, mock_ohlc_response):
+        """
+        Test that a repeated OHLC request within the TTL reuses the response.
+        Should only hit the API once.
+        """
+        client = CoinGeckoAPI()
+        with patch.object(client, '_make_request', return_value=mock_ohlc_response) as mock_request:
+            first = client.get_coin_ohlc('bitcoin', 'usd', 7)
+            second = client.get_coin_ohlc('bitcoin', 'usd', 7)
+        
+        assert first == second == mock_ohlc_response
+        mock_request.assert_called_once_with("coins/bitcoin/ohlc", {"vs_currency": "usd", "days": 7})
+    
+    def test_expired_or_different_request_hits_api(self, mock_ohlc_response, monkeypatch):
+        """
+        Test that expired entries and different parameters bypass the cache.
+        Should hit the API for each of them.
+        """
+        client = CoinGeckoAPI()
+        with patch.object(client, '_make_request', return_value=mock_ohlc_response) as mock_request:
+            client.get_coin_ohlc('bitcoin', 'usd', 1)
+            client.get_coin_ohlc('bitcoin', 'eur', 1)
+            
+            # Move past the intraday TTL
+            now = time.time()
+            monkeypatch.setattr('time.time', lambda: now + CoinGeckoAPI.INTRADAY_CACHE_TTL + 1)
+            client.get_coin_ohlc('bitcoin', 'usd', 1)
+        
+        assert mock_request.call_count == 3
@@ -2,11 +2,13 @@
 Tests for the price fetching functionality.
 """
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, DEFAULT
 import json
 from rich.console import Console
 import io
 import sys
+import threading
+import time
 
 # Import the modules to test
 from app.price import get_current_prices, get_prices_with_change
@@ -624,5 +626,335 @@ class TestMultipleCryptosEdgeCases:
                 else:
                     pytest.fail(f"Unexpected exception: {e}")
 
+
+class TestPriceCache:
+    """Test cases for the on-disk stale-while-revalidate price cache."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        """API client whose price cache lives in a temporary directory"""
+        monkeypatch.setattr(CoinGeckoAPI, 'PRICE_CACHE_DIR', str(tmp_path))
+        monkeypatch.setattr(CoinGeckoAPI, 'PRICE_CACHE_TTL', 10.0)
+        monkeypatch.setattr(CoinGeckoAPI, 'PRICE_CACHE_SWR', 30.0)
+        return CoinGeckoAPI()
+
+    def test_fresh_cache_skips_api(self, client, mock_simple_price_response):
+        """
+        Test that a second price request within the TTL is served from disk.
+        Should hit the API only once.
+        """
+        with patch.object(client, '_make_request', return_value=mock_simple_price_response) as mock_request:
+            first = client.get_price(['bitcoin'], ['usd'])
+            second = client.get_price(['bitcoin'], ['usd'])
+
+        assert first == second == mock_simple_price_response
+        mock_request.assert_called_once()
+
+    def test_stale_cache_served_while_refreshing(self, client, mock_simple_price_response, monkeypatch):
+        """
+        Test that a stale entry is returned immediately and refreshed in the background.
+        Should return the cached data and hit the API once more for the refresh.
+        """
+        refreshed = {"bitcoin": {"usd": 1.0}}
+        with patch.object(client, '_make_request', return_value=mock_simple_price_response):
+            client.get_price(['bitcoin'], ['usd'])
+
+        now = time.time()
+        monkeypatch.setattr('time.time', lambda: now + 15)
+        running = set(threading.enumerate())
+        with patch.object(client, '_make_request', return_value=refreshed) as mock_request:
+            result = client.get_price(['bitcoin'], ['usd'])
+            refreshers = [thread for thread in threading.enumerate() if thread not in running]
+            for thread in refreshers:
+                thread.join()
+
+        assert result == mock_simple_price_response
+        # A daemon refresh never keeps a one-shot command from exiting
+        assert all(thread.daemon for thread in refreshers)
+        mock_request.assert_called_once()
+        assert client.get_price(['bitcoin'], ['usd']) == refreshed
+
+    def test_expired_cache_fetches_inline(self, client, mock_simple_price_response, monkeypatch):
+        """
+        Test that an entry older than TTL + SWR is refetched before returning.
+        Should return the new data.
+        """
+        refreshed = {"bitcoin": {"usd": 1.0}}
+        with patch.object(client, '_make_request', return_value=mock_simple_price_response):
+            client.get_price(['bitcoin'], ['usd'])
+
+        now = time.time()
+        monkeypatch.setattr('time.time', lambda: now + 60)
+        with patch.object(client, '_make_request', return_value=refreshed) as mock_request:
+            assert client.get_price(['bitcoin'], ['usd']) == refreshed
+        mock_request.assert_called_once()
+
+    def test_coin_markets_use_price_cache(self, client, tmp_path):
+        """
+        Test that market listings go through the same on-disk cache as prices.
+        Should hit the API once per distinct request and write one entry for each.
+        """
+        markets = [{"id": "bitcoin", "current_price": 40000.0, "market_cap_rank": 1}]
+        with patch.object(client, '_make_request', return_value=markets) as mock_request:
+            first = client.get_coin_markets(vs_currency='usd', count=5)
+            second = client.get_coin_markets(vs_currency='usd', count=5)
+            other = client.get_coin_markets(vs_currency='eur', count=5)
+
+        assert first == second == other == markets
+        assert [c.args[0] for c in mock_request.call_args_list] == ["coins/markets", "coins/markets"]
+        assert mock_request.call_args_list[1].args[1]["vs_currency"] == "eur"
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_failed_cache_write_leaves_no_temp_file(self, client, tmp_path, mock_simple_price_response, monkeypatch):
+        """
+        Test that a cache write failing at the final rename cleans up after itself.
+        Should still return the fetched data and leave the cache directory empty.
+        """
+        def failing_replace(src, dst):
+            raise OSError("rename failed")
+
+        monkeypatch.setattr('app.utils.cache.os.replace', failing_replace)
+        with patch.object(client, '_make_request', return_value=mock_simple_price_response):
+            assert client.get_price(['bitcoin'], ['usd']) == mock_simple_price_response
+
+        assert list(tmp_path.iterdir()) == []
+
+class TestPlainPriceOutput:
+    """Test cases for the plain-text price output used when stdout is not a terminal."""
+
+    def test_piped_output_is_plain_text(self, mock_simple_price_response):
+        """
+        Test that the price table is written as tab-separated text to a non-terminal console.
+        Should print the title, header and one row without table borders.
+        """
+        console_output = io.StringIO()
+        with patch('app.price.console', Console(file=console_output)):
+            from app.price import format_price_table
+            format_price_table(mock_simple_price_response, ['usd', 'eur'])
+
+        assert console_output.getvalue().splitlines() == [
+            "Current Cryptocurrency Prices",
+            "Coin\tUSD\tEUR",
+            "bitcoin\t$40,000.00\t€34,000.00",
+        ]
+
+    def test_terminal_output_uses_rich_table(self, mock_simple_price_response):
+        """
+        Test that a terminal console still gets the rich table.
+        Should draw table borders around the prices.
+        """
+        console_output = io.StringIO()
+        with patch('app.price.console', Console(file=console_output, force_terminal=True, width=80)):
+            from app.price import format_price_table
+            format_price_table(mock_simple_price_response, ['usd'])
+
+        output = console_output.getvalue()
+        assert "$40,000.00" in output
+        assert "\t" not in output
+        assert "┃" in output
+
+    def test_unranked_coins_sort_last(self):
+        """
+        Test that coins without a market cap rank are listed after the ranked ones.
+        Should show "N/A" in the rank column instead of "#0".
+        """
+        price_data = {
+            "newcoin": {"usd": 0.5, "market_cap_rank": None, "symbol": "new", "name": "New Coin"},
+            "ethereum": {"usd": 3000.0, "market_cap_rank": 2, "symbol": "eth", "name": "Ethereum"},
+            "oldcoin": {"usd": 1.0, "symbol": "old", "name": "Old Coin"},
+            "bitcoin": {"usd": 40000.0, "market_cap_rank": 1, "symbol": "btc", "name": "Bitcoin"},
+        }
+        console_output = io.StringIO()
+        with patch('app.price.console', Console(file=console_output)):
+            from app.price import format_detailed_price_table
+            format_detailed_price_table(price_data, 'usd')
+
+        rows = [line.split("\t")[:4] for line in console_output.getvalue().splitlines()[2:]]
+        assert rows == [
+            ["#1", "Bitcoin", "BTC", "$40,000.00"],
+            ["#2", "Ethereum", "ETH", "$3,000.00"],
+            ["N/A", "New Coin", "NEW", "$0.50"],
+            ["N/A", "Old Coin", "OLD", "$1.00"],
+        ]
+
+    def test_missing_market_cap_rank_stays_none(self):
+        """
+        Test that a market entry without a rank is not turned into rank 0.
+        Should keep market_cap_rank as None in the detailed result.
+        """
+        markets = [{"id": "newcoin", "symbol": "new", "name": "New Coin", "current_price": 0.5}]
+        with patch('app.price.api') as mock_markets_api:
+            mock_markets_api.get_coin_markets.return_value = markets
+            result = get_prices_with_change(['newcoin'], 'usd', display=False)
+
+        assert result["newcoin"]["market_cap_rank"] is None
+
+
+class TestPriceCommandValidation:
+    """Test cases for argument validation in the price CLI command."""
+
+    @pytest.mark.parametrize("args", [
+        ['bitcoin', '-c', ','],
+        ['bitcoin', '-c', ',', '--detailed'],
+        ['bitcoin', '-c', ' , ', '--detailed'],
+    ], ids=["simple", "detailed", "detailed_blank"])
+    def test_empty_currency_list(self, cli_runner, args):
+        """
+        Test that a currency option with no currencies in it is rejected.
+        Should print an error without requesting any prices.
+        """
+        from app.main import price
+
+        with patch.multiple('app.main', get_current_prices=DEFAULT,
+                            get_prices_with_change=DEFAULT) as mocks:
+            result = cli_runner.invoke(price, args)
+
+        assert result.exit_code == 0
+        assert result.exception is None
+        assert "Please specify at least one currency" in result.output
+        mocks['get_current_prices'].assert_not_called()
+        mocks['get_prices_with_change'].assert_not_called()
+
+    @pytest.mark.parametrize("args", [
+        ['bitcoin,ETHEREUM', 'bitcoin', '-c', 'usd,USD'],
+        [' Bitcoin , ethereum,', 'ETHEREUM', '-c', ' usd, ,Usd '],
+    ], ids=["mixed_case", "padded"])
+    def test_coins_and_currencies_are_normalized(self, cli_runner, args):
+        """
+        Test that comma lists, spacing, case and duplicates are normalized.
+        Should request each coin and currency once, lowercased, in first-seen order.
+        """
+        from app.main import price
+
+        with patch.multiple('app.main', get_current_prices=DEFAULT,
+                            get_prices_with_change=DEFAULT) as mocks:
+            result = cli_runner.invoke(price, args)
+
+        assert result.exit_code == 0
+        mocks['get_current_prices'].assert_called_once_with(['bitcoin', 'ethereum'], ['usd'])
+        mocks['get_prices_with_change'].assert_not_called()
+
+    def test_detailed_single_currency_is_normalized(self, cli_runner):
+        """
+        Test that a detailed request repeating one currency takes the single-currency path.
+        Should call get_prices_with_change once with the normalized coins and currency.
+        """
+        from app.main import price
+
+        with patch.multiple('app.main', get_current_prices=DEFAULT,
+                            get_prices_with_change=DEFAULT) as mocks:
+            result = cli_runner.invoke(price, ['bitcoin,ETHEREUM', 'bitcoin', '-c', 'usd,USD', '--detailed'])
+
+        assert result.exit_code == 0
+        mocks['get_prices_with_change'].assert_called_once_with(['bitcoin', 'ethereum'], 'usd')
+        mocks['get_current_prices'].assert_not_called()
+
+
+class _CountingStringIO(io.StringIO):
+    """StringIO that counts how many non-empty writes it receives"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        # rich flushes an empty buffer when a capture ends; that writes nothing
+        if s:
+            self.writes += 1
+        return super().write(s)
+
+
+def _detailed_prices(coin_ids, vs_currency='usd', display=True):
+    """Stand-in for get_prices_with_change returning one ranked coin per currency"""
+    return {
+        "bitcoin": {
+            vs_currency: 40000.0,
+            f"{vs_currency}_24h_change": 2.5,
+            f"{vs_currency}_market_cap": 800000000000,
+            f"{vs_currency}_volume": 25000000000,
+            "market_cap_rank": 1,
+            "symbol": "btc",
+            "name": "Bitcoin"
+        }
+    }
+
+
+class TestDetailedPriceCommand:
+    """Test cases for the detailed price CLI command with several currencies."""
+
+    @pytest.mark.parametrize("terminal", [False, True], ids=["plain", "terminal"])
+    def test_tables_reach_stdout_in_one_write(self, cli_runner, terminal):
+        """
+        Test that the tables for several currencies are written out together.
+        Should issue a single write to the console's stream for all three tables.
+        """
+        from app.main import price
+
+        output = _CountingStringIO()
+        shared_console = Console(file=output, force_terminal=terminal, width=120)
+        with patch('app.main.console', shared_console), \
+                patch('app.price.console', shared_console), \
+                patch('app.main.get_prices_with_change', side_effect=_detailed_prices):
+            result = cli_runner.invoke(price, ['bitcoin', '-c', 'usd,eur,gbp', '--detailed'])
+
+        assert result.exit_code == 0
+        assert output.getvalue().count("Cryptocurrency Prices and Market Data") == 3
+        assert output.writes == 1
+
+    def test_tables_follow_currency_order(self, cli_runner):
+        """
+        Test that tables print in the order the currencies were given, not completion order.
+        Should fetch every currency with display=False and print each warning next to its table.
+        """
+        from app.main import price
+        from app.utils.formatting import print_warning
+
+        # The first currency finishes last, so completion order is the reverse
+        delays = {'eur': 0.1, 'usd': 0.05, 'gbp': 0.0}
+
+        def slow_prices(coin_ids, vs_currency='usd', display=True):
+            time.sleep(delays[vs_currency])
+            print_warning(f"Could not find detailed data for: dogecoin ({vs_currency})")
+            return _detailed_prices(coin_ids, vs_currency, display)
+
+        with patch('app.main.get_prices_with_change', side_effect=slow_prices) as mock_prices:
+            result = cli_runner.invoke(price, ['bitcoin,dogecoin', '-c', 'eur,usd,gbp', '--detailed'])
+
+        assert result.exit_code == 0
+        assert all(c.kwargs == {'display': False} for c in mock_prices.call_args_list)
+        assert sorted(c.args[1] for c in mock_prices.call_args_list) == ['eur', 'gbp', 'usd']
+
+        lines = result.output.splitlines()
+        marks = [line for line in lines if line.startswith(("Warning:", "Cryptocurrency Prices"))]
+        assert marks == [
+            "Warning: Could not find detailed data for: dogecoin (eur)",
+            "Cryptocurrency Prices and Market Data (in EUR)",
+            "Warning: Could not find detailed data for: dogecoin (usd)",
+            "Cryptocurrency Prices and Market Data (in USD)",
+            "Warning: Could not find detailed data for: dogecoin (gbp)",
+            "Cryptocurrency Prices and Market Data (in GBP)",
+        ]
+
+    def test_empty_currency_result_is_skipped(self, cli_runner):
+        """
+        Test that a currency with no detailed data does not stop the others.
+        Should print the tables for the other currencies only.
+        """
+        from app.main import price
+
+        def prices_without_usd(coin_ids, vs_currency='usd', display=True):
+            return {} if vs_currency == 'usd' else _detailed_prices(coin_ids, vs_currency, display)
+
+        with patch('app.main.get_prices_with_change', side_effect=prices_without_usd):
+            result = cli_runner.invoke(price, ['bitcoin', '-c', 'eur,usd,gbp', '--detailed'])
+
+        assert result.exit_code == 0
+        titles = [line for line in result.output.splitlines() if line.startswith("Cryptocurrency Prices")]
+        assert titles == [
+            "Cryptocurrency Prices and Market Data (in EUR)",
+            "Cryptocurrency Prices and Market Data (in GBP)",
+        ]
+
+
 if __name__ == "__main__":
-    pytest.main()
\ No newline at end of file
+    pytest.main()
@@ -5,8 +5,13 @@ import pytest
 import os
 import json
 import tempfile
+from io import StringIO
 from unittest.mock import patch, MagicMock
-from app.trending import get_trending_coins, get_trending, display_trending_coins, get_trending_nfts
+from rich.console import Console
+from app.trending import (get_trending_coins, get_trending, display_trending_coins, display_trending_nfts,
+                          get_trending_nfts, save_trending_data)
+from app.trending import (_VECTORIZE_MIN_ROWS, _format_btc_price, _format_btc_prices,
+                          _format_score, _format_scores)
 
 
 class TestTrendingCoins:
@@ -172,7 +177,7 @@ class TestMainTrendingCommand:
         # Verify save function was called correctly
         mock_save.assert_called_once_with({"coins": mock_trending_coins_response["coins"],
                                           "updated_at": mock_trending_coins_response["updated_at"]},
-                                          "coins", "test.json")
+                                          "coins", "test.json", pretty=False)
 
 class TestTrendingNFTs:
     """Test cases for trending NFTs functionality."""
@@ -383,4 +388,103 @@ class TestTrendingCombined:
         assert "coins" in result
         assert "nfts" in result
         assert len(result["coins"]) == 0   # Empty due to exception
-        assert len(result["nfts"]) == 3    # From mock_trending_nfts_response
\ No newline at end of file
+        assert len(result["nfts"]) == 3    # From mock_trending_nfts_response
+
+
+class TestSaveTrendingData:
+    """Test cases for writing trending data to JSON files."""
+
+    @pytest.mark.parametrize("pretty", [False, True], ids=["compact", "pretty"])
+    def test_save_round_trip(self, tmp_path, mock_trending_combined_response, pretty):
+        """Test that saved data reloads unchanged, indented only when pretty is set."""
+        target = tmp_path / "trending.json"
+
+        path = save_trending_data(mock_trending_combined_response, "all", str(target), pretty=pretty)
+
+        assert path == str(target)
+        raw = target.read_text(encoding="utf-8")
+        assert json.loads(raw) == mock_trending_combined_response
+        assert ("\n" in raw) is pretty
+
+    def test_save_appends_extension_and_overwrites(self, tmp_path, mock_trending_coins_response):
+        """Test that .json is appended and an existing longer file is fully replaced."""
+        target = tmp_path / "trending.json"
+        target.write_text("x" * 100000)
+
+        path = save_trending_data(mock_trending_coins_response, "coins", str(tmp_path / "trending"))
+
+        assert path == str(target)
+        assert json.loads(target.read_text(encoding="utf-8")) == mock_trending_coins_response
+
+    @pytest.mark.parametrize("command,getter", [
+        ("trending", "get_trending"),
+        ("trending_coins", "get_trending_coins"),
+        ("trending_nfts", "get_trending_nfts"),
+    ])
+    @pytest.mark.parametrize("flags,pretty", [([], False), (["--pretty"], True)], ids=["default", "pretty"])
+    def test_pretty_option_reaches_save(self, cli_runner, command, getter, flags, pretty):
+        """Test that the trending commands save compact JSON unless --pretty is given."""
+        import app.main
+
+        with patch(f"app.main.{getter}") as mock_get:
+            result = cli_runner.invoke(getattr(app.main, command), ["--save", *flags])
+
+        assert result.exit_code == 0
+        assert mock_get.call_args.kwargs["pretty"] is pretty
+
+
+class TestTrendingPlainOutput:
+    """Test cases for the plain-text tables used when stdout is not a terminal."""
+
+    def test_display_trending_coins_piped(self, mock_trending_coins_response):
+        """Test that trending coins are written as tab-separated text without table borders."""
+        output = StringIO()
+        with patch("app.trending.console", Console(file=output)):
+            display_trending_coins(mock_trending_coins_response)
+
+        lines = output.getvalue().splitlines()
+        assert lines[:5] == [
+            "CoinGecko Trending Coins",
+            "#\tName\tSymbol\tMarket Cap Rank\tBTC Price\tScore",
+            "1\tBitcoin\tBTC\t1\t₿ 1.00000000\t1",
+            "2\tEthereum\tETH\t2\t₿ 0.05000000\t2",
+            "3\tSolana\tSOL\t5\t₿ 0.00250000\t3",
+        ]
+        assert any(line.startswith("Last updated: ") for line in lines[5:])
+
+    def test_display_trending_nfts_piped(self, mock_trending_nfts_response):
+        """Test that trending NFTs are written as tab-separated text without table borders."""
+        output = StringIO()
+        with patch("app.trending.console", Console(file=output)):
+            display_trending_nfts(mock_trending_nfts_response)
+
+        lines = output.getvalue().splitlines()
+        assert lines[:3] == [
+            "CoinGecko Trending NFTs",
+            "#\tName\tSymbol\tFloor Price (ETH)\t24h Volume\tMarket Cap\tScore",
+            "1\tBored Ape Yacht Club\tBAYC\tΞ 45.5000\t$5,600,000.00\t$450,000,000.00\t1",
+        ]
+        assert len(lines) > 4
+
+
+class TestTrendingColumnFormatting:
+    """Test cases for the column formatters used by the trending tables."""
+
+    # Long enough to take the NumPy path, mixing numbers with values it must skip
+    PRICES = [0.00012345, 1, 2.5, None, "abc", "0.5", True, float("nan"), 10**20, -3.25] * 3
+    SCORES = [0, 1, 41, None, "abc", "7", True, 2**63 - 2, 2**63 - 1, 2**63, 2**70, -2**63] * 2
+
+    def test_inputs_take_vectorized_path(self):
+        """The fixture columns must be longer than the vectorize threshold."""
+        assert len(self.PRICES) > _VECTORIZE_MIN_ROWS
+        assert len(self.SCORES) > _VECTORIZE_MIN_ROWS
+
+    def test_btc_prices_match_scalar_formatting(self):
+        """Test that vectorized BTC prices format exactly like the per-item path."""
+        assert _format_btc_prices(self.PRICES) == [_format_btc_price(p) for p in self.PRICES]
+
+    def test_scores_match_scalar_formatting(self):
+        """Test that vectorized scores format exactly like the per-item path, including ints beyond int64."""
+        expected = [_format_score(s) for s in self.SCORES]
+        assert _format_scores(self.SCORES) == expected
+        assert str(2**63 + 1) in expected